@@ -2,8 +2,9 @@
 Event Handler Interface
 イベントハンドラーのインターフェース
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Type, List
+from typing import ClassVar, Type
 from domain.shared.domain_event import DomainEvent
 
 
@@ -12,8 +13,15 @@ class EventHandler(ABC):
     イベントハンドラーの基底クラス
     
     すべてのイベントハンドラーはこのクラスを継承する。
+    処理するイベントタイプはクラス属性 event_type で宣言し、
+    購読時にインスタンスを調べ直さずに済むようにする。
     """
     
+    __slots__ = ()
+    
+    # このハンドラーが処理するイベントタイプ（サブクラスで指定）
+    event_type: ClassVar[Type[DomainEvent]]
+    
     @abstractmethod
     def handle(self, event: DomainEvent) -> None:
         """
@@ -24,12 +32,24 @@ class EventHandler(ABC):
         """
         pass
     
-    @abstractmethod
-    def handles_event(self) -> Type[DomainEvent]:
+    async def handle_async(self, event: DomainEvent) -> None:
+        """
+        イベントを非同期で処理する
+        
+        デフォルトでは同期版のhandleを別スレッドで実行する。
+        I/Oを伴うハンドラーはオーバーライドしてネイティブに非同期化できる。
+        
+        Args:
+            event: 処理するドメインイベント
+        """
+        await asyncio.to_thread(self.handle, event)
+    
+    @classmethod
+    def handles_event(cls) -> Type[DomainEvent]:
         """
         このハンドラーが処理するイベントタイプを返す
         
         Returns:
             処理するイベントのクラス
         """
-        pass
\ No newline at end of file
+        return cls.event_type
\ No newline at end of file
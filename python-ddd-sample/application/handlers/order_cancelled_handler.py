@@ -2,11 +2,12 @@
 Order Cancelled Event Handler
 注文キャンセルイベントのハンドラー
 """
-from typing import Type
+import logging
 from application.event_handler import EventHandler
-from domain.shared.domain_event import DomainEvent
 from domain.order.order_events import OrderCancelledEvent
 
+logger = logging.getLogger(__name__)
+
 
 class ReleaseInventoryHandler(EventHandler):
     """
@@ -15,6 +16,10 @@ class ReleaseInventoryHandler(EventHandler):
     OrderCancelledEventを受け取って、予約していた在庫を解放する。
     """
     
+    __slots__ = ('_inventory_service',)
+    
+    event_type = OrderCancelledEvent
+    
     def __init__(self, inventory_service=None):
         """
         初期化
@@ -31,19 +36,15 @@ class ReleaseInventoryHandler(EventHandler):
         Args:
             event: 注文キャンセルイベント
         """
-        print(f"🔓 Releasing inventory for cancelled Order {event.aggregate_id}")
-        
         # 実際のシステムでは、ここで在庫解放処理を実行
         if self._inventory_service:
             self._inventory_service.release_reservation(event.aggregate_id)
-        else:
-            # デモ用の出力
-            print(f"   Order ID: {event.aggregate_id}")
-            print(f"   Reason: {event.reason if event.reason else 'No reason provided'}")
-    
-    def handles_event(self) -> Type[DomainEvent]:
-        """処理するイベントタイプ"""
-        return OrderCancelledEvent
+            return
+        
+        # デモ用の出力
+        logger.debug("🔓 Releasing inventory for cancelled Order %s", event.aggregate_id)
+        logger.debug("   Order ID: %s", event.aggregate_id)
+        logger.debug("   Reason: %s", event.reason or 'No reason provided')
 
 
 class RefundPaymentHandler(EventHandler):
@@ -53,6 +54,10 @@ class RefundPaymentHandler(EventHandler):
     OrderCancelledEventを受け取って、支払い済みの場合は返金処理を開始する。
     """
     
+    __slots__ = ('_payment_service',)
+    
+    event_type = OrderCancelledEvent
+    
     def __init__(self, payment_service=None):
         """
         初期化
@@ -69,22 +74,18 @@ class RefundPaymentHandler(EventHandler):
         Args:
             event: 注文キャンセルイベント
         """
-        print(f"💰 Processing refund for cancelled Order {event.aggregate_id}")
-        
         # 実際のシステムでは、ここで返金処理を実行
         if self._payment_service:
             self._payment_service.initiate_refund(
                 order_id=event.aggregate_id,
                 customer_id=event.customer_id
             )
-        else:
-            # デモ用の出力
-            print(f"   Customer: {event.customer_id}")
-            print(f"   Cancelled at: {event.cancelled_at.isoformat()}")
-    
-    def handles_event(self) -> Type[DomainEvent]:
-        """処理するイベントタイプ"""
-        return OrderCancelledEvent
+            return
+        
+        # デモ用の出力
+        logger.debug("💰 Processing refund for cancelled Order %s", event.aggregate_id)
+        logger.debug("   Customer: %s", event.customer_id)
+        logger.debug("   Cancelled at: %s", event.cancelled_at)
 
 
 class SendCancellationEmailHandler(EventHandler):
@@ -94,6 +95,10 @@ class SendCancellationEmailHandler(EventHandler):
     OrderCancelledEventを受け取って、顧客にキャンセル通知メールを送信する。
     """
     
+    __slots__ = ('_email_service',)
+    
+    event_type = OrderCancelledEvent
+    
     def __init__(self, email_service=None):
         """
         初期化
@@ -110,8 +115,6 @@ class SendCancellationEmailHandler(EventHandler):
         Args:
             event: 注文キャンセルイベント
         """
-        print(f"📧 Sending cancellation email for Order {event.aggregate_id}")
-        
         # 実際のシステムでは、ここでメール送信処理を実行
         if self._email_service:
             self._email_service.send_cancellation_notice(
@@ -120,13 +123,11 @@ class SendCancellationEmailHandler(EventHandler):
                 reason=event.reason,
                 cancelled_at=event.cancelled_at
             )
-        else:
-            # デモ用の出力
-            print(f"   To: Customer {event.customer_id}")
-            print(f"   Order ID: {event.aggregate_id}")
-            if event.reason:
-                print(f"   Reason: {event.reason}")
-    
-    def handles_event(self) -> Type[DomainEvent]:
-        """処理するイベントタイプ"""
-        return OrderCancelledEvent
\ No newline at end of file
+            return
+        
+        # デモ用の出力
+        logger.debug("📧 Sending cancellation email for Order %s", event.aggregate_id)
+        logger.debug("   To: Customer %s", event.customer_id)
+        logger.debug("   Order ID: %s", event.aggregate_id)
+        if event.reason:
+            logger.debug("   Reason: %s", event.reason)
\ No newline at end of file
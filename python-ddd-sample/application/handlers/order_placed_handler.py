@@ -2,11 +2,13 @@
 Order Placed Event Handler
 注文確定イベントのハンドラー
 """
-from typing import Type
+import asyncio
+import logging
 from application.event_handler import EventHandler
-from domain.shared.domain_event import DomainEvent
 from domain.order.order_events import OrderPlacedEvent
 
+logger = logging.getLogger(__name__)
+
 
 class SendOrderConfirmationEmailHandler(EventHandler):
     """
@@ -15,6 +17,10 @@ class SendOrderConfirmationEmailHandler(EventHandler):
     OrderPlacedEventを受け取って、顧客に確認メールを送信する。
     """
     
+    __slots__ = ('_email_service',)
+    
+    event_type = OrderPlacedEvent
+    
     def __init__(self, email_service=None):
         """
         初期化
@@ -31,8 +37,6 @@ class SendOrderConfirmationEmailHandler(EventHandler):
         Args:
             event: 注文確定イベント
         """
-        print(f"📧 Sending order confirmation email for Order {event.aggregate_id}")
-        
         # 実際のシステムでは、ここでメール送信処理を実行
         if self._email_service:
             self._email_service.send_confirmation(
@@ -41,16 +45,14 @@ class SendOrderConfirmationEmailHandler(EventHandler):
                 total_amount=event.total_amount,
                 items=event.items
             )
-        else:
-            # デモ用の出力
-            print(f"   To: Customer {event.customer_id}")
-            print(f"   Order ID: {event.aggregate_id}")
-            print(f"   Total: ¥{event.total_amount:,}")
-            print(f"   Items: {len(event.items)} item(s)")
-    
-    def handles_event(self) -> Type[DomainEvent]:
-        """処理するイベントタイプ"""
-        return OrderPlacedEvent
+            return
+        
+        # デモ用の出力
+        logger.debug("📧 Sending order confirmation email for Order %s", event.aggregate_id)
+        logger.debug("   To: Customer %s", event.customer_id)
+        logger.debug("   Order ID: %s", event.aggregate_id)
+        logger.debug("   Total: ¥%s", event.total_amount)
+        logger.debug("   Items: %s item(s)", len(event.items))
 
 
 class NotifyInventorySystemHandler(EventHandler):
@@ -60,6 +62,10 @@ class NotifyInventorySystemHandler(EventHandler):
     OrderPlacedEventを受け取って、在庫システムに通知する。
     """
     
+    __slots__ = ('_inventory_service',)
+    
+    event_type = OrderPlacedEvent
+    
     def __init__(self, inventory_service=None):
         """
         初期化
@@ -76,23 +82,23 @@ class NotifyInventorySystemHandler(EventHandler):
         Args:
             event: 注文確定イベント
         """
-        print(f"📦 Notifying inventory system for Order {event.aggregate_id}")
-        
         # 実際のシステムでは、ここで在庫予約処理を実行
         if self._inventory_service:
-            for item in event.items:
-                self._inventory_service.reserve_stock(
-                    product_id=item['product_id'],
-                    quantity=item['quantity']
-                )
-        else:
-            # デモ用の出力
-            for item in event.items:
-                print(f"   Reserve: {item['product_id']} x {item['quantity']}")
-    
-    def handles_event(self) -> Type[DomainEvent]:
-        """処理するイベントタイプ"""
-        return OrderPlacedEvent
+            if hasattr(self._inventory_service, 'reserve_stock_bulk'):
+                # 一括予約に対応していれば、明細をまとめて1回で予約する
+                self._inventory_service.reserve_stock_bulk(items=event.items)
+            else:
+                for item in event.items:
+                    self._inventory_service.reserve_stock(
+                        product_id=item.product_id,
+                        quantity=item.quantity
+                    )
+            return
+        
+        # デモ用の出力
+        logger.debug("📦 Notifying inventory system for Order %s", event.aggregate_id)
+        for item in event.items:
+            logger.debug("   Reserve: %s x %s", item.product_id, item.quantity)
 
 
 class UpdateAnalyticsHandler(EventHandler):
@@ -102,14 +108,20 @@ class UpdateAnalyticsHandler(EventHandler):
     OrderPlacedEventを受け取って、分析データを更新する。
     """
     
-    def __init__(self, analytics_service=None):
+    __slots__ = ('_analytics_service', '_simulated_delay')
+    
+    event_type = OrderPlacedEvent
+    
+    def __init__(self, analytics_service=None, simulated_delay: float = 0.0):
         """
         初期化
         
         Args:
             analytics_service: 分析サービス
+            simulated_delay: デモ時に処理時間を模擬する秒数（0なら待たない）
         """
         self._analytics_service = analytics_service
+        self._simulated_delay = simulated_delay
     
     async def handle_async(self, event: OrderPlacedEvent) -> None:
         """
@@ -118,8 +130,6 @@ class UpdateAnalyticsHandler(EventHandler):
         Args:
             event: 注文確定イベント
         """
-        print(f"📊 Updating analytics for Order {event.aggregate_id}")
-        
         # 実際のシステムでは、ここで分析データを更新
         if self._analytics_service:
             await self._analytics_service.record_order(
@@ -128,11 +138,13 @@ class UpdateAnalyticsHandler(EventHandler):
                 total_amount=event.total_amount,
                 placed_at=event.placed_at
             )
-        else:
-            # デモ用の出力（非同期処理のシミュレーション）
-            import asyncio
-            await asyncio.sleep(0.1)  # 処理時間のシミュレーション
-            print(f"   Analytics updated for amount: ¥{event.total_amount:,}")
+            return
+        
+        # デモ用の出力（非同期処理のシミュレーション）
+        logger.debug("📊 Updating analytics for Order %s", event.aggregate_id)
+        if self._simulated_delay:
+            await asyncio.sleep(self._simulated_delay)  # 処理時間のシミュレーション
+        logger.debug("   Analytics updated for amount: ¥%s", event.total_amount)
     
     def handle(self, event: OrderPlacedEvent) -> None:
         """
@@ -141,8 +153,6 @@ class UpdateAnalyticsHandler(EventHandler):
         Args:
             event: 注文確定イベント
         """
-        print(f"📊 Updating analytics for Order {event.aggregate_id} (sync)")
-        
         if self._analytics_service:
             self._analytics_service.record_order_sync(
                 order_id=event.aggregate_id,
@@ -150,9 +160,8 @@ class UpdateAnalyticsHandler(EventHandler):
                 total_amount=event.total_amount,
                 placed_at=event.placed_at
             )
-        else:
-            print(f"   Analytics updated for amount: ¥{event.total_amount:,}")
-    
-    def handles_event(self) -> Type[DomainEvent]:
-        """処理するイベントタイプ"""
-        return OrderPlacedEvent
\ No newline at end of file
+            return
+        
+        # デモ用の出力
+        logger.debug("📊 Updating analytics for Order %s (sync)", event.aggregate_id)
+        logger.debug("   Analytics updated for amount: ¥%s", event.total_amount)
\ No newline at end of file
@@ -2,7 +2,7 @@
 OrderApplicationService
 注文に関するアプリケーションサービス（ユースケース層）
 """
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 from domain.order.order import Order
 from domain.order.order_id import OrderId
@@ -53,18 +53,44 @@ class OrderApplicationService:
         customer_id = CustomerId(command.customer_id)
         order = Order.create(customer_id)
         
-        # 商品を追加
-        for item in command.items:
-            product_id = ProductId(item['product_id'])
-            quantity = item['quantity']
-            unit_price = Money.from_yen(item['unit_price'])
-            order.add_item(product_id, quantity, unit_price)
+        # 同じ商品は先にまとめ、商品ごとに1回だけ追加する（合計金額の更新は1回）
+        order.add_items(
+            (ProductId.of(product_id), quantity, Money.from_yen(unit_price))
+            for product_id, (quantity, unit_price) in self._merge_items(command.items).items()
+        )
         
         # 保存
         await self._order_repository.save(order)
         
         return str(order.id)
     
+    @staticmethod
+    def _merge_items(items: list[dict]) -> Dict[str, Tuple[int, int]]:
+        """
+        コマンドの明細を商品IDごとにまとめる（内部メソッド）
+        
+        Order.add_itemと同じく、単価は最初に現れた明細のものを使う。
+        合計すると正しく見える明細（-1個と3個など）を通さないよう、数量はまとめる前に明細ごとに検証する。
+        
+        Returns:
+            商品ID -> (数量の合計, 単価) の辞書（最初に現れた順）
+            
+        Raises:
+            ValueError: 数量が1以上の整数でない明細がある場合
+        """
+        merged: Dict[str, Tuple[int, int]] = {}
+        for item in items:
+            quantity = item['quantity']
+            if type(quantity) is not int or quantity <= 0:
+                raise ValueError('数量は1以上である必要があります')
+            product_id = item['product_id']
+            previous = merged.get(product_id)
+            if previous is None:
+                merged[product_id] = (quantity, item['unit_price'])
+            else:
+                merged[product_id] = (previous[0] + quantity, previous[1])
+        return merged
+    
     async def place_order(self, command: PlaceOrderCommand) -> None:
         """
         注文を確定（Use Case: 注文確定の流れを管理）
@@ -103,18 +129,7 @@ class OrderApplicationService:
         """
         order = await self._order_repository.find_by_id(OrderId(order_id))
         
-        if not order:
-            return None
-        
-        return {
-            'order_id': str(order.id),
-            'customer_id': str(order.customer_id),
-            'status': order.status.value,
-            'total_amount': order.total_amount.format(),
-            'item_count': order.item_count,
-            'items': order.get_items(),
-            'placed_at': order.placed_at.isoformat() if order.placed_at else None
-        }
+        return order.summary() if order else None
     
     async def cancel_order(self, order_id: str) -> None:
         """
@@ -18,6 +18,8 @@ class CustomerStatus(Enum):
 class Customer:
     """顧客エンティティ"""
     
+    __slots__ = ('_id', '_name', '_email', '_status', '_loyalty_points')
+    
     def __init__(self, customer_id: CustomerId, name: str, email: Email):
         """
         顧客を生成
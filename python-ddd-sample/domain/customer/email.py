@@ -3,15 +3,22 @@ Email Value Object
 メールアドレスを表現する値オブジェクト
 """
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+# メールアドレスの形式（インスタンス生成のたびにパターンを引かないようモジュールで保持）
+_EMAIL_RE = re.compile(r'[^\s@]+@[^\s@]+\.[^\s@]+')
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Email:
     """不変のメールアドレス値オブジェクト"""
     
     value: str
     
+    # __post_init__で一度だけ分割した結果（等価性・表示には使わない）
+    _local_part: str = field(init=False, repr=False, compare=False)
+    _domain: str = field(init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """生成時のバリデーション"""
         if not self._is_valid(self.value):
@@ -19,21 +26,25 @@ class Email:
         
         # 小文字に正規化
         object.__setattr__(self, 'value', self.value.lower())
+        
+        local_part, _, domain = self.value.partition('@')
+        object.__setattr__(self, '_local_part', local_part)
+        object.__setattr__(self, '_domain', domain)
     
-    def _is_valid(self, email: str) -> bool:
+    @staticmethod
+    def _is_valid(email: str) -> bool:
         """メールアドレスの形式をチェック"""
-        email_regex = r'^[^\s@]+@[^\s@]+\.[^\s@]+$'
-        return re.match(email_regex, email) is not None
+        return _EMAIL_RE.fullmatch(email) is not None
     
     @property
     def domain(self) -> str:
         """ドメイン部分を取得"""
-        return self.value.split('@')[1]
+        return self._domain
     
     @property
     def local_part(self) -> str:
         """ローカル部分を取得"""
-        return self.value.split('@')[0]
+        return self._local_part
     
     def __str__(self) -> str:
         return self.value
\ No newline at end of file
@@ -2,16 +2,17 @@
 Order Aggregate Root
 注文集約のルートエンティティ
 """
-from enum import Enum
-from datetime import datetime
-from typing import List, Optional, Dict
+from enum import IntFlag
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator, Optional, Dict, Tuple
 from .order_id import OrderId
 from .product_id import ProductId
-from .order_item import OrderItem
+from .order_item import OrderItem, OrderItemView
 from .order_events import (
     OrderCreatedEvent,
     OrderItemAddedEvent,
     OrderPlacedEvent,
+    OrderPlacedLineItem,
     OrderCancelledEvent,
     OrderShippedEvent
 )
@@ -19,20 +20,45 @@ from ..customer.customer_id import CustomerId
 from ..shared.money import Money
 from ..shared.aggregate_root import AggregateRoot
 
+_UTC = timezone.utc
 
-class OrderStatus(Enum):
-    """注文ステータス"""
-    DRAFT = 'DRAFT'
-    PLACED = 'PLACED'
-    PAID = 'PAID'
-    SHIPPED = 'SHIPPED'
-    DELIVERED = 'DELIVERED'
-    CANCELLED = 'CANCELLED'
+
+class OrderStatus(IntFlag):
+    """
+    注文ステータス
+    
+    ビットフラグにしておき、複数ステータスの判定をマスク1回で行う。
+    外部へ出すときは name（'DRAFT' など）を使う。
+    """
+    DRAFT = 1
+    PLACED = 2
+    PAID = 4
+    SHIPPED = 8
+    DELIVERED = 16
+    CANCELLED = 32
+
+
+# 遷移先ステータス -> (遷移元として許可するステータスのマスク, 許可されないときのエラーメッセージ)
+_TRANSITIONS: Dict[OrderStatus, Tuple[OrderStatus, str]] = {
+    OrderStatus.PLACED: (OrderStatus.DRAFT, '下書き状態の注文のみ確定できます'),
+    OrderStatus.PAID: (OrderStatus.PLACED, '確定済みの注文のみ支払い可能です'),
+    OrderStatus.SHIPPED: (OrderStatus.PAID, '支払い済みの注文のみ出荷可能です'),
+    OrderStatus.DELIVERED: (OrderStatus.SHIPPED, '出荷済みの注文のみ配送完了にできます'),
+    OrderStatus.CANCELLED: (
+        OrderStatus.DRAFT | OrderStatus.PLACED | OrderStatus.PAID,
+        'この注文はキャンセルできません'
+    ),
+}
 
 
 class Order(AggregateRoot):
     """注文集約のルートエンティティ"""
     
+    __slots__ = (
+        '_id', '_customer_id', '_id_str', '_customer_id_str',
+        '_items', '_items_snapshot', '_status', '_total_amount', '_placed_at', '_summary_cache'
+    )
+    
     MAX_ITEMS = 100
     
     def __init__(self, order_id: OrderId, customer_id: CustomerId):
@@ -44,12 +70,17 @@ class Order(AggregateRoot):
             customer_id: 顧客ID
         """
         super().__init__()  # AggregateRootの初期化
-        self._id = order_id
-        self._customer_id = customer_id
-        self._items: List[OrderItem] = []
-        self._status = OrderStatus.DRAFT
-        self._total_amount = Money.zero()
+        self._id: OrderId = order_id
+        self._customer_id: CustomerId = customer_id
+        # イベントやサマリーに載せる文字列表現（IDは不変なので一度だけ取り出す）
+        self._id_str: str = order_id.value
+        self._customer_id_str: str = customer_id.value
+        self._items: Dict[ProductId, OrderItem] = {}  # 商品ID -> 明細（追加順を保つ）
+        self._items_snapshot: Optional[Tuple[OrderItemView, ...]] = None  # 明細変更時に破棄
+        self._status: OrderStatus = OrderStatus.DRAFT
+        self._total_amount: Money = Money.zero()
         self._placed_at: Optional[datetime] = None
+        self._summary_cache: Optional[Dict[str, Any]] = None  # 状態変更時に破棄
     
     @classmethod
     def create(cls, customer_id: CustomerId) -> 'Order':
@@ -58,8 +89,8 @@ class Order(AggregateRoot):
         
         # イベント発行: 注文が作成された
         order.add_domain_event(OrderCreatedEvent(
-            aggregate_id=str(order._id),
-            customer_id=str(customer_id)
+            aggregate_id=order._id_str,
+            customer_id=order._customer_id_str
         ))
         
         return order
@@ -75,139 +106,164 @@ class Order(AggregateRoot):
         """
         self._ensure_can_modify()
         
+        # 合計は差分だけ更新する
+        self._total_amount = self._add_line(self._total_amount, product_id, quantity, unit_price)
+        self._clear_cached_views()
+    
+    def add_items(self, items: Iterable[Tuple[ProductId, int, Money]]) -> None:
+        """
+        複数の商品をまとめて追加
+        
+        add_itemを順に呼ぶのと同じ結果になるが、合計金額の更新と
+        キャッシュの破棄は最後に一度だけ行う。
+        
+        Args:
+            items: (商品ID, 数量, 単価) の組
+        """
+        self._ensure_can_modify()
+        
+        total = self._total_amount
+        add_line = self._add_line  # ループ内の属性参照を避ける
+        try:
+            for product_id, quantity, unit_price in items:
+                total = add_line(total, product_id, quantity, unit_price)
+        finally:
+            # 途中で失敗しても、追加済みの明細と合計金額は一致させる
+            self._total_amount = total
+            self._clear_cached_views()
+    
+    def _add_line(self, total: Money, product_id: ProductId, quantity: int, unit_price: Money) -> Money:
+        """
+        明細を追加し、合計金額totalに差分を反映した金額を返す（内部メソッド）
+        
+        合計金額の保存は呼び出し側で行う。既存商品への追加では数量が減ることもあるため、
+        変更前後の小計の差を反映する。明細を変更できなかったときは例外を送出し、
+        明細も合計金額も変えない。
+        """
         if len(self._items) >= self.MAX_ITEMS:
             raise ValueError(f'注文には最大{self.MAX_ITEMS}個まで追加可能です')
         
-        # 既存商品の数量を増やす
-        existing_item = self._find_item(product_id)
+        # 既存商品の数量を増やす（負の数量なら減らす）
+        existing_item = self._items.get(product_id)
         if existing_item:
+            old_subtotal = existing_item.subtotal
             existing_item.change_quantity(existing_item.quantity + quantity)
-        else:
-            new_item = OrderItem(product_id, quantity, unit_price)
-            self._items.append(new_item)
-            
-            # イベント発行: 商品が追加された
-            self.add_domain_event(OrderItemAddedEvent(
-                aggregate_id=str(self._id),
-                product_id=str(product_id),
-                quantity=quantity,
-                unit_price=unit_price.amount
-            ))
+            return total.subtract(old_subtotal).add(existing_item.subtotal)
         
-        self._recalculate_total()
+        new_item = OrderItem(product_id, quantity, unit_price)
+        self._items[product_id] = new_item
+        
+        # イベント発行: 商品が追加された
+        self.add_domain_event(OrderItemAddedEvent(
+            aggregate_id=self._id_str,
+            product_id=product_id.value,
+            quantity=quantity,
+            unit_price=unit_price.amount
+        ))
+        return total.add(new_item.subtotal)
     
     def remove_item(self, product_id: ProductId) -> None:
         """商品を削除"""
         self._ensure_can_modify()
         
-        item_index = self._find_item_index(product_id)
-        if item_index == -1:
+        item = self._items.pop(product_id, None)
+        if item is None:
             raise ValueError('指定された商品が見つかりません')
         
-        self._items.pop(item_index)
-        self._recalculate_total()
+        self._total_amount = self._total_amount.subtract(item.subtotal)
+        self._clear_cached_views()
     
     def change_item_quantity(self, product_id: ProductId, new_quantity: int) -> None:
         """商品の数量を変更"""
         self._ensure_can_modify()
         
-        item = self._find_item(product_id)
+        item = self._items.get(product_id)
         if not item:
             raise ValueError('指定された商品が見つかりません')
         
+        old_subtotal = item.subtotal
         item.change_quantity(new_quantity)
-        self._recalculate_total()
+        self._total_amount = self._total_amount.subtract(old_subtotal).add(item.subtotal)
+        self._clear_cached_views()
     
     def place(self) -> None:
         """注文を確定"""
-        if self._status != OrderStatus.DRAFT:
-            raise ValueError('下書き状態の注文のみ確定できます')
+        self._ensure_can_transition(OrderStatus.PLACED)
         
         if len(self._items) == 0:
             raise ValueError('商品が選択されていません')
         
-        self._status = OrderStatus.PLACED
-        self._placed_at = datetime.now()
+        self._transition(OrderStatus.PLACED)
+        # 確定時刻とイベント発生時刻は同じ瞬間なので、時刻の取得は1回にする
+        now = datetime.now(_UTC)
+        self._placed_at = now
         
         # イベント発行: 注文が確定された
-        items_data = [
-            {
-                'product_id': str(item.product_id),
-                'quantity': item.quantity,
-                'unit_price': item.unit_price.amount,
-                'subtotal': item.subtotal.amount
-            }
-            for item in self._items
-        ]
+        items_data = tuple(
+            OrderPlacedLineItem(
+                item.product_id.value,
+                item.quantity,
+                item.unit_price.amount,
+                item.subtotal.amount
+            )
+            for item in self._items.values()
+        )
         
         self.add_domain_event(OrderPlacedEvent(
-            aggregate_id=str(self._id),
-            customer_id=str(self._customer_id),
+            aggregate_id=self._id_str,
+            customer_id=self._customer_id_str,
             total_amount=self._total_amount.amount,
             items=items_data,
-            placed_at=self._placed_at
+            placed_at=now,
+            occurred_at=now
         ))
     
     def mark_as_paid(self) -> None:
         """支払い完了"""
-        if self._status != OrderStatus.PLACED:
-            raise ValueError('確定済みの注文のみ支払い可能です')
-        
-        self._status = OrderStatus.PAID
+        self._transition(OrderStatus.PAID)
     
     def ship(self) -> None:
         """出荷"""
-        if self._status != OrderStatus.PAID:
-            raise ValueError('支払い済みの注文のみ出荷可能です')
-        
-        self._status = OrderStatus.SHIPPED
+        self._transition(OrderStatus.SHIPPED)
     
     def deliver(self) -> None:
         """配送完了"""
-        if self._status != OrderStatus.SHIPPED:
-            raise ValueError('出荷済みの注文のみ配送完了にできます')
-        
-        self._status = OrderStatus.DELIVERED
+        self._transition(OrderStatus.DELIVERED)
     
     def cancel(self, reason: str = "") -> None:
         """キャンセル"""
-        if self._status in [OrderStatus.SHIPPED, OrderStatus.DELIVERED, OrderStatus.CANCELLED]:
-            raise ValueError('この注文はキャンセルできません')
-        
-        self._status = OrderStatus.CANCELLED
+        self._transition(OrderStatus.CANCELLED)
+        now = datetime.now(_UTC)
         
         # イベント発行: 注文がキャンセルされた
         self.add_domain_event(OrderCancelledEvent(
-            aggregate_id=str(self._id),
-            customer_id=str(self._customer_id),
+            aggregate_id=self._id_str,
+            customer_id=self._customer_id_str,
             reason=reason,
-            cancelled_at=datetime.now()
+            cancelled_at=now,
+            occurred_at=now
         ))
     
-    def _find_item(self, product_id: ProductId) -> Optional[OrderItem]:
-        """商品を検索（内部メソッド）"""
-        for item in self._items:
-            if item.has_product(product_id):
-                return item
-        return None
+    def _ensure_can_transition(self, to_status: OrderStatus) -> None:
+        """指定ステータスへ遷移できるかチェック（内部メソッド）"""
+        allowed, message = _TRANSITIONS[to_status]
+        if not self._status & allowed:
+            raise ValueError(message)
     
-    def _find_item_index(self, product_id: ProductId) -> int:
-        """商品のインデックスを検索（内部メソッド）"""
-        for i, item in enumerate(self._items):
-            if item.has_product(product_id):
-                return i
-        return -1
+    def _transition(self, to_status: OrderStatus) -> None:
+        """遷移表に従ってステータスを変更（内部メソッド）"""
+        self._ensure_can_transition(to_status)
+        self._status = to_status
+        self._summary_cache = None
     
-    def _recalculate_total(self) -> None:
-        """合計金額の再計算（内部メソッド）"""
-        total = Money.zero()
-        for item in self._items:
-            total = total.add(item.get_subtotal())
-        self._total_amount = total
+    def _clear_cached_views(self) -> None:
+        """明細スナップショットとサマリーのキャッシュを破棄（内部メソッド）"""
+        self._items_snapshot = None
+        self._summary_cache = None
     
     def _ensure_can_modify(self) -> None:
         """変更可能かチェック（内部メソッド）"""
-        if self._status != OrderStatus.DRAFT:
+        if self._status is not OrderStatus.DRAFT:
             raise ValueError('下書き状態の注文のみ変更可能です')
     
     @property
@@ -234,20 +290,67 @@ class Order(AggregateRoot):
     def item_count(self) -> int:
         return len(self._items)
     
-    def get_items(self) -> List[Dict]:
+    def iter_items(self) -> Iterator[OrderItemView]:
+        """
+        注文明細のスナップショットを順に返す
+        
+        一度走査するだけの呼び出し側向け。スナップショットのタプルがまだなければ
+        組み立てずに1件ずつ生成する。走査中に注文を変更してはならない。
+        """
+        if self._items_snapshot is not None:
+            yield from self._items_snapshot
+            return
+        for item in self._items.values():
+            yield item.to_view()
+    
+    def get_items(self) -> Tuple[OrderItemView, ...]:
         """
         注文明細のスナップショットを返す
         （直接の参照を返さない）
+        
+        スナップショットは不変なので、明細が変わるまで同じものを使い回す。
+        """
+        if self._items_snapshot is None:
+            self._items_snapshot = tuple(item.to_view() for item in self._items.values())
+        return self._items_snapshot
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        注文サマリーを返す
+        
+        次に状態が変わるまで組み立て結果をキャッシュし、呼び出しごとに浅いコピーを返す。
         """
-        return [
-            {
-                'product_id': item.product_id,
-                'quantity': item.quantity,
-                'unit_price': item.unit_price,
-                'subtotal': item.get_subtotal()
+        if self._summary_cache is None:
+            self._summary_cache = {
+                'order_id': self._id_str,
+                'customer_id': self._customer_id_str,
+                'status': self._status.name,
+                'total_amount': self._total_amount.format(),
+                'total_amount_yen': self._total_amount.amount,  # 比較・集計用の数値
+                'item_count': len(self._items),
+                'items': self.get_items(),
+                'placed_at': self._placed_at.isoformat() if self._placed_at else None
             }
-            for item in self._items
-        ]
+        return dict(self._summary_cache)
+    
+    def __copy__(self) -> 'Order':
+        """
+        同じ状態の注文を複製する
+        
+        明細とドメインイベントのリストは複製側で独立させ、
+        複製への変更が元の注文に及ばないようにする。
+        """
+        cls = type(self)
+        clone = cls.__new__(cls)
+        for name in Order.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone._items = {
+            product_id: OrderItem(item.product_id, item.quantity, item.unit_price)
+            for product_id, item in self._items.items()
+        }
+        clone._domain_events = list(self._domain_events) if self._domain_events else None
+        clone._clear_cached_views()
+        return clone
     
     def __eq__(self, other: object) -> bool:
         """IDによる等価性判定"""
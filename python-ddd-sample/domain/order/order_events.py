@@ -3,19 +3,26 @@ Order Aggregate Domain Events
 注文集約で発生するドメインイベント
 """
 from dataclasses import dataclass, field
-from typing import Any, Dict, List
-from datetime import datetime
+from typing import Any, ClassVar, Dict, NamedTuple, Tuple
+from datetime import datetime, timezone
 from domain.shared.domain_event import DomainEvent
 
 
+class OrderPlacedLineItem(NamedTuple):
+    """注文確定イベントに載せる明細（辞書への変換はto_dictのときだけ行う）"""
+    product_id: str
+    quantity: int
+    unit_price: int
+    subtotal: int
+
+
 @dataclass(frozen=True)
 class OrderCreatedEvent(DomainEvent):
     """注文作成イベント"""
     
-    customer_id: str = ""
+    EVENT_NAME: ClassVar[str] = "OrderCreated"
     
-    def event_name(self) -> str:
-        return "OrderCreated"
+    customer_id: str = ""
     
     def _get_event_data(self) -> Dict[str, Any]:
         return {
@@ -27,13 +34,12 @@ class OrderCreatedEvent(DomainEvent):
 class OrderItemAddedEvent(DomainEvent):
     """注文商品追加イベント"""
     
+    EVENT_NAME: ClassVar[str] = "OrderItemAdded"
+    
     product_id: str = ""
     quantity: int = 0
     unit_price: int = 0
     
-    def event_name(self) -> str:
-        return "OrderItemAdded"
-    
     def _get_event_data(self) -> Dict[str, Any]:
         return {
             'product_id': self.product_id,
@@ -46,19 +52,18 @@ class OrderItemAddedEvent(DomainEvent):
 class OrderPlacedEvent(DomainEvent):
     """注文確定イベント"""
     
+    EVENT_NAME: ClassVar[str] = "OrderPlaced"
+    
     customer_id: str = ""
     total_amount: int = 0
-    items: List[Dict[str, Any]] = field(default_factory=list)
-    placed_at: datetime = field(default_factory=datetime.now)
-    
-    def event_name(self) -> str:
-        return "OrderPlaced"
+    items: Tuple[OrderPlacedLineItem, ...] = ()
+    placed_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     
     def _get_event_data(self) -> Dict[str, Any]:
         return {
             'customer_id': self.customer_id,
             'total_amount': self.total_amount,
-            'items': self.items,
+            'items': [item._asdict() for item in self.items],
             'placed_at': self.placed_at.isoformat()
         }
 
@@ -67,12 +72,11 @@ class OrderPlacedEvent(DomainEvent):
 class OrderCancelledEvent(DomainEvent):
     """注文キャンセルイベント"""
     
+    EVENT_NAME: ClassVar[str] = "OrderCancelled"
+    
     customer_id: str = ""
     reason: str = ""
-    cancelled_at: datetime = field(default_factory=datetime.now)
-    
-    def event_name(self) -> str:
-        return "OrderCancelled"
+    cancelled_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     
     def _get_event_data(self) -> Dict[str, Any]:
         return {
@@ -86,11 +90,10 @@ class OrderCancelledEvent(DomainEvent):
 class OrderShippedEvent(DomainEvent):
     """注文出荷イベント"""
     
-    tracking_number: str = ""
-    shipped_at: datetime = field(default_factory=datetime.now)
+    EVENT_NAME: ClassVar[str] = "OrderShipped"
     
-    def event_name(self) -> str:
-        return "OrderShipped"
+    tracking_number: str = ""
+    shipped_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     
     def _get_event_data(self) -> Dict[str, Any]:
         return {
@@ -2,23 +2,15 @@
 OrderId Value Object
 """
 import uuid
-from dataclasses import dataclass
+from ..shared.string_id import StringId
 
 
-@dataclass(frozen=True)
-class OrderId:
+class OrderId(StringId):
     """不変の注文ID値オブジェクト"""
     
-    value: str
-    
-    def __post_init__(self):
-        if not self.value or not self.value.strip():
-            raise ValueError('OrderIdは空にできません')
+    __slots__ = ()
     
     @classmethod
     def generate(cls) -> 'OrderId':
         """新しいIDを生成"""
-        return cls(str(uuid.uuid4()))
-    
-    def __str__(self) -> str:
-        return self.value
\ No newline at end of file
+        return cls(uuid.uuid4().hex)
\ No newline at end of file
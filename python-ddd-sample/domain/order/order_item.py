@@ -2,13 +2,24 @@
 OrderItem Entity (Aggregate内の子Entity)
 注文明細を表現するエンティティ
 """
+from typing import NamedTuple
 from .product_id import ProductId
 from ..shared.money import Money
 
 
+class OrderItemView(NamedTuple):
+    """注文明細の読み取り専用スナップショット"""
+    product_id: ProductId
+    quantity: int
+    unit_price: Money
+    subtotal: Money
+
+
 class OrderItem:
     """注文明細エンティティ（Aggregate内の子Entity）"""
     
+    __slots__ = ('_product_id', '_quantity', '_unit_price', '_subtotal')
+    
     def __init__(self, product_id: ProductId, quantity: int, unit_price: Money):
         """
         注文明細を生成
@@ -21,24 +32,34 @@ class OrderItem:
         if quantity <= 0:
             raise ValueError('数量は1以上である必要があります')
         
-        self._product_id = product_id
-        self._quantity = quantity
-        self._unit_price = unit_price
+        self._product_id: ProductId = product_id
+        self._quantity: int = quantity
+        self._unit_price: Money = unit_price
+        self._subtotal: Money = unit_price.multiply(quantity)  # 数量変更時に再計算
     
     def change_quantity(self, new_quantity: int) -> None:
         """数量を変更"""
         if new_quantity <= 0:
             raise ValueError('数量は1以上である必要があります')
         self._quantity = new_quantity
+        self._subtotal = self._unit_price.multiply(new_quantity)
     
     def get_subtotal(self) -> Money:
-        """小計を計算"""
-        return self._unit_price.multiply(self._quantity)
+        """小計を返す（数量変更時に計算済みの値）"""
+        return self._subtotal
+    
+    def to_view(self) -> OrderItemView:
+        """現在の状態の読み取り専用スナップショットを返す"""
+        return OrderItemView(self._product_id, self._quantity, self._unit_price, self._subtotal)
     
     def has_product(self, product_id: ProductId) -> bool:
         """指定された商品かチェック"""
         return self._product_id == product_id
     
+    @property
+    def subtotal(self) -> Money:
+        return self._subtotal
+    
     @property
     def product_id(self) -> ProductId:
         return self._product_id
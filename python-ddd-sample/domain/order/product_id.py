@@ -1,18 +1,21 @@
 """
 ProductId Value Object
 """
-from dataclasses import dataclass
+import functools
+from ..shared.string_id import StringId
 
 
-@dataclass(frozen=True)
-class ProductId:
+class ProductId(StringId):
     """不変の商品ID値オブジェクト"""
     
-    value: str
+    __slots__ = ()
     
-    def __post_init__(self):
-        if not self.value or not self.value.strip():
-            raise ValueError('ProductIdは空にできません')
-    
-    def __str__(self) -> str:
-        return self.value
\ No newline at end of file
+    @classmethod
+    @functools.lru_cache(maxsize=4096)
+    def of(cls, value: str) -> 'ProductId':
+        """
+        文字列から商品IDを生成
+        
+        ProductIdは不変なので、同じ商品コードには同じインスタンスを返す。
+        """
+        return cls(value)
\ No newline at end of file
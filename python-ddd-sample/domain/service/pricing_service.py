@@ -3,10 +3,61 @@ PricingService Domain Service
 価格計算に関するドメインサービス
 複数の集約をまたぐビジネスロジックを実装
 """
+import functools
+from typing import Final
 from domain.order.order import Order
 from domain.customer.customer import Customer
 from domain.shared.money import Money
 
+# 呼び出しのたびに生成しないよう、金額の定数はモジュール読み込み時に一度だけ作る
+# 注文金額はすべて円（JPY）で扱う前提のため、しきい値との比較は金額の整数値で行う
+_LARGE_ORDER_THRESHOLD: Final = Money.from_yen(10000)
+_FREE_SHIPPING_THRESHOLD: Final = Money.from_yen(5000)
+_STANDARD_SHIPPING_FEE: Final = Money.from_yen(500)
+
+
+def _loyalty_tier(loyalty_points: int) -> int:
+    """ロイヤリティポイントから会員ランクを求める（0: なし, 1: 1000pt以上, 2: 2000pt以上）"""
+    if loyalty_points >= 2000:
+        return 2
+    if loyalty_points >= 1000:
+        return 1
+    return 0
+
+
+@functools.lru_cache(maxsize=1024)
+def _discount_rate(tier: int, is_large_order: bool) -> float:
+    """
+    会員ランクと大口注文かどうかから割引率を求める
+    
+    割引率はこの2つだけで決まる純粋な計算なので、結果をキャッシュする。
+    """
+    discount_rate = 0.0
+    if tier == 2:
+        discount_rate = 0.1
+    elif tier == 1:
+        discount_rate = 0.05
+    if is_large_order:
+        discount_rate += 0.02
+    if discount_rate > 0.3:
+        discount_rate = 0.3
+    return discount_rate
+
+
+def _compute_discount_yen(total_yen: int, loyalty_points: int) -> int:
+    """
+    注文金額（円）とロイヤリティポイントから割引額（円）を求める
+    
+    値オブジェクトを介さない整数だけの計算。Money.multiplyと同じく端数は切り捨てる。
+    """
+    tier = _loyalty_tier(loyalty_points)
+    is_large_order = total_yen >= _LARGE_ORDER_THRESHOLD.amount
+    
+    # ポイントも金額も基準に届かなければ割引はない
+    if tier == 0 and not is_large_order:
+        return 0
+    return int(total_yen * _discount_rate(tier, is_large_order))
+
 
 class PricingService:
     """価格計算ドメインサービス"""
@@ -22,36 +73,12 @@ class PricingService:
         Returns:
             割引金額
         """
-        if not customer.is_active():
-            return Money.zero()
-        
         order_amount = order.total_amount
-        loyalty_points = customer.loyalty_points
-        
-        # TODO(human): 割引計算ロジックを実装
-        # ヒント：
-        # - loyalty_pointsに基づいた割引率を計算
-        # - order_amountの金額に応じた追加割引
-        # - 最大割引率の制限（例：30%まで）
-        
-        discount_rate = 0.0
+        discount_yen = self._discount_yen(customer, order_amount.amount)
+        if discount_yen == 0:
+            return Money.zero()
         
-        # ここに実装を追加してください
-        # Guidance: ロイヤリティポイントによる段階的な割引（例：1000ポイントで5%、2000ポイントで10%
-        # ）、注文金額による追加割引（例：10000円以上で追加2%）、そして最大割引率の制限（例：30%まで
-        # ）を考慮してください。計算結果はdiscount_rateとして0.0〜0.3の範囲の小数として表現し、最終
-        # 的にorder_amount.multiply(discount_rate)で割引金額を返します。
-        discount_rate = 0.0
-        if loyalty_points >= 2000:
-            discount_rate = 0.1
-        elif loyalty_points >= 1000:
-            discount_rate = 0.05
-        if order_amount.greater_than_or_equal(Money.from_yen(10000)):
-            discount_rate += 0.02
-        if discount_rate > 0.3:
-            discount_rate = 0.3
-
-        return order_amount.multiply(discount_rate)
+        return Money(discount_yen, order_amount.currency)
     
     def calculate_shipping_fee(self, order: Order) -> Money:
         """
@@ -63,13 +90,10 @@ class PricingService:
         Returns:
             送料
         """
-        FREE_SHIPPING_THRESHOLD = Money.from_yen(5000)
-        STANDARD_SHIPPING_FEE = Money.from_yen(500)
-        
-        if order.total_amount.greater_than_or_equal(FREE_SHIPPING_THRESHOLD):
+        if self._shipping_yen(order.total_amount.amount) == 0:
             return Money.zero()
         
-        return STANDARD_SHIPPING_FEE
+        return _STANDARD_SHIPPING_FEE
     
     def calculate_final_amount(self, customer: Customer, order: Order) -> Money:
         """
@@ -83,7 +107,27 @@ class PricingService:
             最終請求額
         """
         subtotal = order.total_amount
-        discount = self.calculate_discount(customer, order)
-        shipping = self.calculate_shipping_fee(order)
+        subtotal_yen = subtotal.amount
+        
+        # 途中の割引額・送料はMoneyにせず整数のまま計算し、最後に一度だけ包む
+        discount_yen = self._discount_yen(customer, subtotal_yen)
+        shipping_yen = self._shipping_yen(subtotal_yen)
         
-        return subtotal.subtract(discount).add(shipping)
\ No newline at end of file
+        return Money(subtotal_yen - discount_yen + shipping_yen, subtotal.currency)
+    
+    def _discount_yen(self, customer: Customer, total_yen: int) -> int:
+        """
+        割引額を円の整数で求める（内部メソッド）
+        
+        非アクティブな顧客には割引しない。割引の規則（ポイントによる段階的な割引率、
+        10000円以上の追加2%、上限30%）は_compute_discount_yenが計算する。
+        """
+        if not customer.is_active():
+            return 0
+        return _compute_discount_yen(total_yen, customer.loyalty_points)
+    
+    def _shipping_yen(self, total_yen: int) -> int:
+        """送料を円の整数で求める（内部メソッド。5000円以上は無料）"""
+        if total_yen >= _FREE_SHIPPING_THRESHOLD.amount:
+            return 0
+        return _STANDARD_SHIPPING_FEE.amount
\ No newline at end of file
@@ -2,7 +2,7 @@
 Aggregate Root Base Class
 集約ルートの基底クラス
 """
-from typing import List
+from typing import List, Optional
 from domain.shared.domain_event import DomainEvent
 
 
@@ -14,9 +14,12 @@ class AggregateRoot:
     すべての集約ルートはこのクラスを継承する。
     """
     
+    __slots__ = ('_domain_events',)
+    
     def __init__(self):
         """初期化"""
-        self._domain_events: List[DomainEvent] = []
+        # 読み込んだだけの集約はイベントを持たないので、最初の追加までリストを作らない
+        self._domain_events: Optional[List[DomainEvent]] = None
     
     def add_domain_event(self, event: DomainEvent) -> None:
         """
@@ -25,6 +28,8 @@ class AggregateRoot:
         Args:
             event: 発生したドメインイベント
         """
+        if self._domain_events is None:
+            self._domain_events = []
         self._domain_events.append(event)
     
     def get_domain_events(self) -> List[DomainEvent]:
@@ -34,7 +39,7 @@ class AggregateRoot:
         Returns:
             ドメインイベントのリスト
         """
-        return self._domain_events.copy()
+        return list(self._domain_events) if self._domain_events else []
     
     def clear_domain_events(self) -> None:
         """
@@ -42,15 +47,17 @@ class AggregateRoot:
         
         通常はリポジトリが永続化後に呼び出す
         """
-        self._domain_events.clear()
+        self._domain_events = None
     
     def pull_domain_events(self) -> List[DomainEvent]:
         """
         ドメインイベントを取得してクリア
         
+        保持していたリストをコピーせずにそのまま渡す。
+        
         Returns:
             ドメインイベントのリスト
         """
-        events = self.get_domain_events()
-        self.clear_domain_events()
+        events = self._domain_events or []
+        self._domain_events = None
         return events
\ No newline at end of file
@@ -4,8 +4,8 @@ Domain Event Base Class
 """
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict
+from datetime import datetime, timezone
+from typing import Any, ClassVar, Dict
 import uuid
 
 
@@ -18,22 +18,44 @@ class DomainEvent(ABC):
     イベントは不変（immutable）であり、過去に起きたことを表現する。
     """
     
+    # イベント名（サブクラスで指定。インスタンスごとではなくクラスで1つだけ持つ）
+    EVENT_NAME: ClassVar[str]
+    
     # イベントの一意識別子
     event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     
-    # イベント発生時刻
-    occurred_at: datetime = field(default_factory=datetime.now)
+    # イベント発生時刻（UTC）
+    occurred_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     
     # イベントを発生させた集約のID
     aggregate_id: str = field(default="")
     
-    @abstractmethod
+    def __init_subclass__(cls, **kwargs):
+        """
+        具象イベントがEVENT_NAMEを宣言しているかをクラス定義時にチェック
+        
+        抽象メソッドが残る中間の基底クラスと、event_nameを自前で実装するクラスは対象外。
+        """
+        super().__init_subclass__(**kwargs)
+        is_abstract = any(
+            getattr(getattr(cls, name, None), '__isabstractmethod__', False)
+            for name in dir(cls)
+        )
+        if is_abstract or cls.event_name is not DomainEvent.event_name:
+            return
+        if not isinstance(getattr(cls, 'EVENT_NAME', None), str):
+            raise TypeError(f'{cls.__name__}はEVENT_NAMEを宣言する必要があります')
+    
     def event_name(self) -> str:
         """イベント名を返す"""
-        pass
+        return self.EVENT_NAME
     
     def to_dict(self) -> Dict[str, Any]:
-        """イベントを辞書形式に変換"""
+        """
+        イベントを辞書形式に変換
+        
+        呼び出しごとに新しい辞書を組み立てる。戻り値を書き換えてもイベントには影響しない。
+        """
         return {
             'event_id': self.event_id,
             'event_name': self.event_name(),
@@ -2,17 +2,21 @@
 Money Value Object
 お金を表現する値オブジェクト
 """
+import functools
 from dataclasses import dataclass
-from typing import Self
+from typing import ClassVar, Dict, Self
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Money:
     """不変の金額値オブジェクト"""
     
     amount: int
     currency: str = 'JPY'
     
+    # 通貨ごとのゼロ金額（不変なので共有する）
+    _ZEROS: ClassVar[Dict[str, 'Money']] = {}
+    
     def __post_init__(self):
         """生成時のバリデーション"""
         if self.amount < 0:
@@ -23,17 +27,35 @@ class Money:
     
     @classmethod
     def zero(cls, currency: str = 'JPY') -> 'Money':
-        """ゼロ金額を生成"""
-        return cls(0, currency)
+        """ゼロ金額を返す（通貨ごとに同じインスタンス）"""
+        zero = cls._ZEROS.get(currency)
+        if zero is None:
+            zero = cls._ZEROS[currency] = cls(0, currency)
+        return zero
     
     @classmethod
     def from_yen(cls, amount: int) -> 'Money':
-        """円で金額を生成"""
+        """
+        円で金額を生成
+        
+        Moneyは不変なので、よく使う金額は同じインスタンスを返す。
+        キャッシュは1000と1000.0やTrueを同じキーとみなすため、使うのはintのときだけにする。
+        """
+        if type(amount) is int:
+            return cls._from_yen_int(amount)
+        return cls(amount, 'JPY')
+    
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def _from_yen_int(cls, amount: int) -> 'Money':
+        """整数の円から金額を生成してキャッシュする（内部メソッド）"""
         return cls(amount, 'JPY')
     
     def add(self, other: 'Money') -> 'Money':
         """金額を加算"""
         self._assert_same_currency(other)
+        if other.amount == 0:
+            return self
         return Money(self.amount + other.amount, self.currency)
     
     def subtract(self, other: 'Money') -> 'Money':
@@ -48,6 +70,10 @@ class Money:
         """金額に乗数をかける"""
         if multiplier < 0:
             raise ValueError('乗数は0以上である必要があります')
+        if multiplier == 1:
+            return self
+        if multiplier == 0:
+            return Money.zero(self.currency)
         return Money(int(self.amount * multiplier), self.currency)
     
     def greater_than(self, other: 'Money') -> bool:
@@ -70,6 +96,12 @@ class Money:
         self._assert_same_currency(other)
         return self.amount <= other.amount
     
+    def __eq__(self, other: object) -> bool:
+        """金額と通貨で等価性を判定（タプルを組み立てずに直接比較する）"""
+        if other.__class__ is Money:
+            return self.amount == other.amount and self.currency == other.currency
+        return NotImplemented
+    
     def is_zero(self) -> bool:
         """ゼロかチェック"""
         return self.amount == 0
@@ -0,0 +1,34 @@
+"""
+String ID Value Object Base
+文字列1つで表すID値オブジェクトの基底クラス
+"""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class StringId:
+    """
+    文字列1つで表す不変のID値オブジェクトの基底クラス
+    
+    サブクラスは__slots__ = ()だけを宣言して継承する（@dataclassを付け直すと
+    __eq__が生成し直されるため付けない）。異なるIDクラス同士は等しくならない。
+    """
+    
+    value: str
+    
+    def __post_init__(self):
+        """生成時のバリデーション"""
+        if not self.value or not self.value.strip():
+            raise ValueError(f'{type(self).__name__}は空にできません')
+    
+    def __eq__(self, other: object) -> bool:
+        """値（文字列）1つの比較で等価性を判定"""
+        if other.__class__ is self.__class__:
+            return self.value == other.value
+        return NotImplemented
+    
+    def __hash__(self) -> int:
+        return hash(self.value)
+    
+    def __str__(self) -> str:
+        return self.value
\ No newline at end of file
@@ -2,12 +2,30 @@
 Event Bus Implementation
 イベントバスの実装
 """
-from typing import Dict, List, Type
+import logging
+from collections import Counter, deque
+from typing import (
+    Awaitable, Callable, Counter as CounterType, Deque, Dict, List, NamedTuple,
+    Optional, Sequence, Tuple, Type
+)
 import asyncio
-from collections import defaultdict
 from domain.shared.domain_event import DomainEvent
 from application.event_handler import EventHandler
 
+logger = logging.getLogger(__name__)
+
+
+class _Subscription(NamedTuple):
+    """
+    購読情報
+    
+    handle / handle_asyncは購読時に一度だけ組み立てる、例外を捕まえて記録するラッパー。
+    配信側はエラー処理を意識せず、購読ごとに関数を1回呼ぶだけでよい。
+    """
+    handler: EventHandler
+    handle: Callable[[DomainEvent], None]
+    handle_async: Callable[[DomainEvent], Awaitable[None]]
+
 
 class InMemoryEventBus:
     """
@@ -17,27 +35,51 @@ class InMemoryEventBus:
     同期・非同期の両方の処理をサポート。
     """
     
-    def __init__(self):
-        """初期化"""
-        # イベントタイプごとのハンドラーを管理
-        self._handlers: Dict[Type[DomainEvent], List[EventHandler]] = defaultdict(list)
+    def __init__(self, history_size: Optional[int] = 10_000):
+        """
+        初期化
+        
+        Args:
+            history_size: イベント履歴に残す最大件数（古いものから捨てる）。
+                Noneなら無制限、0なら履歴を記録しない
+        """
+        # イベントタイプごとの購読を管理
+        # 不変のタプルを保持し、購読の追加・解除では新しいタプルに差し替える（コピーオンライト）。
+        # 配信中に購読が変わっても、配信側が手にしているタプルは変化しない
+        self._handlers: Dict[Type[DomainEvent], Tuple[_Subscription, ...]] = {}
+        
+        # 配信時に使う、基底クラスへの購読も含めて解決済みの購読一覧
+        # （購読の追加・解除で破棄する）
+        self._resolved: Dict[Type[DomainEvent], Tuple[_Subscription, ...]] = {}
         
         # イベント履歴（デバッグ・テスト用）
-        self._event_history: List[DomainEvent] = []
+        self._event_history: Optional[Deque[DomainEvent]] = (
+            deque(maxlen=history_size) if history_size != 0 else None
+        )
+        # 履歴中のイベントのタイプ別件数（履歴と同時に更新し、数えるために走査しない）
+        self._event_counts: CounterType[Type[DomainEvent]] = Counter()
         
         # 非同期処理用のキュー
         self._async_queue: asyncio.Queue = None
     
-    def subscribe(self, handler: EventHandler) -> None:
+    def subscribe(self, handler: EventHandler) -> Callable[[], None]:
         """
         イベントハンドラーを登録
         
         Args:
             handler: 登録するイベントハンドラー
+            
+        Returns:
+            呼び出すとこの購読だけを解除する関数
         """
         event_type = handler.handles_event()
-        self._handlers[event_type].append(handler)
-        print(f"✅ Subscribed {handler.__class__.__name__} to {event_type.__name__}")
+        subscription = _Subscription(
+            handler, self._safe_handle(handler), self._safe_handle_async(handler)
+        )
+        self._handlers[event_type] = self._handlers.get(event_type, ()) + (subscription,)
+        self._resolved.clear()
+        logger.debug("✅ Subscribed %s to %s", handler.__class__.__name__, event_type.__name__)
+        return lambda: self._remove_subscription(event_type, subscription)
     
     def unsubscribe(self, handler: EventHandler) -> None:
         """
@@ -47,9 +89,33 @@ class InMemoryEventBus:
             handler: 解除するイベントハンドラー
         """
         event_type = handler.handles_event()
-        if handler in self._handlers[event_type]:
-            self._handlers[event_type].remove(handler)
-            print(f"❌ Unsubscribed {handler.__class__.__name__} from {event_type.__name__}")
+        for subscription in self._handlers.get(event_type, ()):
+            if subscription.handler is handler:
+                self._remove_subscription(event_type, subscription)
+                return
+    
+    def _remove_subscription(self, event_type: Type[DomainEvent], subscription: _Subscription) -> None:
+        """
+        購読を解除（内部メソッド）
+        
+        Args:
+            event_type: イベントタイプ
+            subscription: 解除する購読情報
+        """
+        subscriptions = self._handlers.get(event_type, ())
+        for i, registered in enumerate(subscriptions):
+            if registered is subscription:
+                remaining = subscriptions[:i] + subscriptions[i + 1:]
+                if remaining:
+                    self._handlers[event_type] = remaining
+                else:
+                    del self._handlers[event_type]
+                self._resolved.clear()
+                logger.debug(
+                    "❌ Unsubscribed %s from %s",
+                    subscription.handler.__class__.__name__, event_type.__name__
+                )
+                return
     
     async def publish(self, event: DomainEvent) -> None:
         """
@@ -59,23 +125,24 @@ class InMemoryEventBus:
             event: 配信するドメインイベント
         """
         # イベント履歴に追加
-        self._event_history.append(event)
+        self._record((event,))
         
-        # 該当するハンドラーを取得
-        event_type = type(event)
-        handlers = self._handlers.get(event_type, [])
+        await self._dispatch(event)
+    
+    async def publish_many(self, events: Sequence[DomainEvent]) -> None:
+        """
+        複数のイベントを順に配信（非同期）
         
-        print(f"📤 Publishing {event.event_name()} to {len(handlers)} handlers")
+        履歴への追加はまとめて1回で行う。イベントの順序は保ち、
+        前のイベントのハンドラーがすべて終わってから次のイベントを配信する。
         
-        # 各ハンドラーで処理（並列実行）
-        tasks = []
-        for handler in handlers:
-            task = self._handle_event_async(handler, event)
-            tasks.append(task)
+        Args:
+            events: 配信するドメインイベント（発生順）
+        """
+        self._record(events)
         
-        # すべてのハンドラーの処理を待つ
-        if tasks:
-            await asyncio.gather(*tasks)
+        for event in events:
+            await self._dispatch(event)
     
     def publish_sync(self, event: DomainEvent) -> None:
         """
@@ -85,44 +152,152 @@ class InMemoryEventBus:
             event: 配信するドメインイベント
         """
         # イベント履歴に追加
-        self._event_history.append(event)
+        self._record((event,))
         
+        self._dispatch_sync(event)
+    
+    def publish_many_sync(self, events: Sequence[DomainEvent]) -> None:
+        """
+        複数のイベントを順に配信（同期）
+        
+        履歴への追加はまとめて1回で行う。ハンドラーのエラーは
+        publish_syncと同じく記録するだけで、残りの配信は続ける。
+        
+        Args:
+            events: 配信するドメインイベント（発生順）
+        """
+        self._record(events)
+        
+        for event in events:
+            self._dispatch_sync(event)
+    
+    def _record(self, events: Sequence[DomainEvent]) -> None:
+        """
+        イベントを履歴に追加し、タイプ別件数を更新（内部メソッド）
+        
+        履歴があふれるときは、捨てられる古いイベントの分を件数から引く。
+        
+        Args:
+            events: 追加するドメインイベント（発生順）
+        """
+        history = self._event_history
+        if history is None:
+            return
+        counts = self._event_counts
+        maxlen = history.maxlen
+        if maxlen is None or len(history) + len(events) <= maxlen:
+            history.extend(events)
+            counts.update(map(type, events))
+            return
+        for event in events:
+            if len(history) == maxlen:
+                counts[type(history[0])] -= 1
+            history.append(event)
+            counts[type(event)] += 1
+    
+    async def _dispatch(self, event: DomainEvent) -> None:
+        """
+        1件のイベントをハンドラーへ非同期に配信（内部メソッド）
+        
+        Args:
+            event: 配信するドメインイベント
+        """
         # 該当するハンドラーを取得
-        event_type = type(event)
-        handlers = self._handlers.get(event_type, [])
+        subscriptions = self._subscriptions_for(type(event))
+        
+        # 配信は高頻度なので、無効時はイベント名の取得も行わない
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📤 Publishing %s to %s handlers", event.event_name(), len(subscriptions))
         
-        print(f"📤 Publishing {event.event_name()} to {len(handlers)} handlers (sync)")
+        # 各ハンドラーは互いに独立しているので並行に処理する
+        # （同一集約のイベント順序は、1件ずつawaitする呼び出し側で保たれる）
+        if subscriptions:
+            await asyncio.gather(*(
+                handle_async(event) for _, _, handle_async in subscriptions
+            ))
+    
+    def _dispatch_sync(self, event: DomainEvent) -> None:
+        """
+        1件のイベントをハンドラーへ同期的に配信（内部メソッド）
         
-        # 各ハンドラーで処理（順次実行）
-        for handler in handlers:
+        Args:
+            event: 配信するドメインイベント
+        """
+        # 該当するハンドラーを取得
+        subscriptions = self._subscriptions_for(type(event))
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📤 Publishing %s to %s handlers (sync)", event.event_name(), len(subscriptions))
+        
+        # 各ハンドラーで処理（順次実行。エラーはラッパー内で記録される）
+        for _, handle, _ in subscriptions:
+            handle(event)
+    
+    def _subscriptions_for(self, event_type: Type[DomainEvent]) -> Tuple[_Subscription, ...]:
+        """
+        イベントタイプに配信すべき購読を取得（内部メソッド）
+        
+        基底のイベントクラスへの購読も対象にする。MROをたどるのは
+        イベントタイプごとに最初の一回だけで、以後は解決済みの一覧を使う。
+        
+        Args:
+            event_type: イベントタイプ
+            
+        Returns:
+            購読のタプル（具体的なクラスへの購読から順に並ぶ）
+        """
+        subscriptions = self._resolved.get(event_type)
+        if subscriptions is None:
+            subscriptions = tuple(
+                subscription
+                for cls in event_type.__mro__
+                for subscription in self._handlers.get(cls, ())
+            )
+            self._resolved[event_type] = subscriptions
+        return subscriptions
+    
+    def _safe_handle(self, handler: EventHandler) -> Callable[[DomainEvent], None]:
+        """
+        例外を記録して握りつぶすhandleのラッパーを作る（内部メソッド）
+        
+        Args:
+            handler: イベントハンドラー
+            
+        Returns:
+            イベントを受け取って処理する関数
+        """
+        handle = handler.handle
+        handle_error = self._handle_error
+        
+        def safe_handle(event: DomainEvent) -> None:
             try:
-                handler.handle(event)
-                print(f"   ✅ {handler.__class__.__name__} processed")
+                handle(event)
             except Exception as e:
-                print(f"   ❌ {handler.__class__.__name__} failed: {e}")
-                # エラーをログに記録（本番環境では適切なロギング）
-                self._handle_error(handler, event, e)
+                handle_error(handler, event, e)
+        
+        return safe_handle
     
-    async def _handle_event_async(self, handler: EventHandler, event: DomainEvent) -> None:
+    def _safe_handle_async(self, handler: EventHandler) -> Callable[[DomainEvent], Awaitable[None]]:
         """
-        非同期でイベントを処理
+        例外を記録して握りつぶすhandle_asyncのラッパーを作る（内部メソッド）
         
         Args:
             handler: イベントハンドラー
-            event: ドメインイベント
-        """
-        try:
-            # ハンドラーがasyncメソッドを持っているか確認
-            if hasattr(handler, 'handle_async'):
-                await handler.handle_async(event)
-            else:
-                # 同期メソッドを非同期で実行
-                await asyncio.to_thread(handler.handle, event)
             
-            print(f"   ✅ {handler.__class__.__name__} processed")
-        except Exception as e:
-            print(f"   ❌ {handler.__class__.__name__} failed: {e}")
-            self._handle_error(handler, event, e)
+        Returns:
+            イベントを受け取って処理するコルーチン関数
+        """
+        handle_async = handler.handle_async
+        handle_error = self._handle_error
+        
+        async def safe_handle_async(event: DomainEvent) -> None:
+            try:
+                # 同期ハンドラーは基底クラスのhandle_asyncが別スレッドで実行する
+                await handle_async(event)
+            except Exception as e:
+                handle_error(handler, event, e)
+        
+        return safe_handle_async
     
     def _handle_error(self, handler: EventHandler, event: DomainEvent, error: Exception) -> None:
         """
@@ -133,27 +308,64 @@ class InMemoryEventBus:
             event: 処理中のイベント
             error: 発生したエラー
         """
-        # 実際のシステムでは、ここでエラーログを記録
-        # 必要に応じてリトライやDLQ（Dead Letter Queue）への送信を実装
+        # エラーログを記録する
+        # 実際のシステムでは、必要に応じてリトライやDLQ（Dead Letter Queue）への送信を実装
         error_info = {
             'handler': handler.__class__.__name__,
             'event': event.to_dict(),
             'error': str(error)
         }
-        print(f"🚨 Error logged: {error_info}")
+        logger.error("🚨 %s failed: %s", handler.__class__.__name__, error_info, exc_info=error)
     
     def get_event_history(self) -> List[DomainEvent]:
         """
         イベント履歴を取得（テスト用）
         
         Returns:
-            イベントのリスト
+            イベントのリスト（古い順。履歴を記録しない設定なら空）
+        """
+        return list(self._event_history) if self._event_history is not None else []
+    
+    def last_event(self) -> Optional[DomainEvent]:
+        """
+        最後に記録されたイベントを取得（テスト用）
+        
+        Returns:
+            最新のイベント（履歴が空ならNone）
+        """
+        return self._event_history[-1] if self._event_history else None
+    
+    def event_count(self) -> int:
         """
-        return self._event_history.copy()
+        履歴に残っているイベント数を取得（テスト用）
+        
+        Returns:
+            イベント数
+        """
+        return len(self._event_history) if self._event_history is not None else 0
+    
+    def count_of(self, event_type: Type[DomainEvent]) -> int:
+        """
+        履歴に残っている特定タイプのイベント数を取得（テスト用）
+        
+        Args:
+            event_type: イベントタイプ（サブクラスは別のタイプとして数える）
+            
+        Returns:
+            イベント数
+        """
+        return self._event_counts[event_type]
+    
+    def clear_handlers(self) -> None:
+        """すべての購読を解除（テスト用）"""
+        self._handlers.clear()
+        self._resolved.clear()
     
     def clear_history(self) -> None:
         """イベント履歴をクリア（テスト用）"""
-        self._event_history.clear()
+        if self._event_history is not None:
+            self._event_history.clear()
+        self._event_counts.clear()
     
     def get_handler_count(self, event_type: Type[DomainEvent]) -> int:
         """
@@ -165,4 +377,4 @@ class InMemoryEventBus:
         Returns:
             ハンドラー数
         """
-        return len(self._handlers.get(event_type, []))
\ No newline at end of file
+        return len(self._handlers.get(event_type, ()))
\ No newline at end of file
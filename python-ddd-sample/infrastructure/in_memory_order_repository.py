@@ -13,41 +13,66 @@ class InMemoryOrderRepository(OrderRepository):
     """インメモリ実装の注文リポジトリ"""
     
     def __init__(self, event_bus=None):
+        # 注文IDの文字列 -> 注文（受け取るのは検証済みのOrderIdだけで、キーにはその値を使う）
         self._orders: Dict[str, Order] = {}
+        self._by_customer: Dict[CustomerId, Dict[str, Order]] = {}  # 顧客ID -> 注文（保存順）
         self._event_bus = event_bus  # イベントバスの注入
     
     async def save(self, order: Order) -> None:
         """注文を保存"""
         # 1. 集約を永続化
-        self._orders[str(order.id)] = order
+        key = order.id.value
+        previous = self._orders.get(key)
+        if previous is not None and previous.customer_id != order.customer_id:
+            self._remove_from_customer_index(previous)
+        self._orders[key] = order
+        self._by_customer.setdefault(order.customer_id, {})[key] = order
         
         # 2. 蓄積されたイベントを配信
         if self._event_bus:
-            events = order.pull_domain_events()
-            for event in events:
-                await self._event_bus.publish(event)
+            await self._event_bus.publish_many(order.pull_domain_events())
+    
+    async def flush_events(self, order: Order) -> None:
+        """
+        保存済みの注文に蓄積されたイベントだけを配信
+        
+        インメモリ実装では保存した注文そのものを保持しているため、
+        保存後の変更を反映し直す必要はなく、索引の更新を省いてイベントだけを送る。
+        """
+        if self._orders.get(order.id.value) is not order:
+            raise ValueError(f'保存されていない注文です: {order.id}')
+        
+        if self._event_bus:
+            await self._event_bus.publish_many(order.pull_domain_events())
     
     async def find_by_id(self, order_id: OrderId) -> Optional[Order]:
         """IDで注文を検索"""
-        return self._orders.get(str(order_id))
+        return self._orders.get(order_id.value)
     
     async def find_by_customer_id(self, customer_id: CustomerId) -> List[Order]:
         """顧客IDで注文を検索"""
-        result = []
-        for order in self._orders.values():
-            if order.customer_id == customer_id:
-                result.append(order)
-        return result
+        orders = self._by_customer.get(customer_id)
+        return list(orders.values()) if orders else []
     
     async def delete(self, order_id: OrderId) -> None:
         """注文を削除"""
-        key = str(order_id)
-        if key in self._orders:
-            del self._orders[key]
+        order = self._orders.pop(order_id.value, None)
+        if order is not None:
+            self._remove_from_customer_index(order)
+    
+    def _remove_from_customer_index(self, order: Order) -> None:
+        """顧客IDの索引から注文を外す（内部メソッド）"""
+        orders = self._by_customer.get(order.customer_id)
+        if orders is None:
+            return
+        orders.pop(order.id.value, None)
+        if not orders:
+            del self._by_customer[order.customer_id]
     
     def clear(self) -> None:
         """全データをクリア（テスト用）"""
         self._orders.clear()
+        self._by_customer.clear()
     
     def size(self) -> int:
         """保存されている注文数を返す（テスト用）"""
@@ -0,0 +1,56 @@
+"""
+テスト共通のフィクスチャ
+"""
+import pytest
+from infrastructure.event_bus import InMemoryEventBus
+from infrastructure.in_memory_order_repository import InMemoryOrderRepository
+from domain.service.pricing_service import PricingService
+from application.order_application_service import OrderApplicationService
+
+
+@pytest.fixture(scope="session")
+def shared_event_bus():
+    """テストセッション全体で使い回すイベントバス"""
+    return InMemoryEventBus()
+
+
+@pytest.fixture
+def event_bus(shared_event_bus):
+    """購読と履歴を空に戻した共有イベントバス"""
+    shared_event_bus.clear_handlers()
+    shared_event_bus.clear_history()
+    return shared_event_bus
+
+
+@pytest.fixture(scope="session")
+def pricing_service():
+    """テストセッション全体で使い回す価格計算サービス（状態を持たない）"""
+    return PricingService()
+
+
+@pytest.fixture(scope="session")
+def shared_order_repository():
+    """テストセッション全体で使い回す注文リポジトリ"""
+    return InMemoryOrderRepository()
+
+
+@pytest.fixture
+def order_repository(shared_order_repository):
+    """空に戻した共有の注文リポジトリ"""
+    shared_order_repository.clear()
+    return shared_order_repository
+
+
+@pytest.fixture(scope="session")
+def shared_order_service(shared_order_repository, pricing_service):
+    """テストセッション全体で使い回す注文アプリケーションサービス"""
+    return OrderApplicationService(
+        order_repository=shared_order_repository,
+        pricing_service=pricing_service
+    )
+
+
+@pytest.fixture
+def order_service(order_repository, shared_order_service):
+    """リポジトリを空に戻した共有の注文アプリケーションサービス"""
+    return shared_order_service
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""
+テスト共通のヘルパー
+"""
+import itertools
+from domain.customer.customer_id import CustomerId
+
+_customer_sequence = itertools.count(1)
+
+
+def next_customer_id() -> CustomerId:
+    """
+    テスト用の顧客IDを払い出す
+    
+    IDの値そのものを検証しないテスト向け。UUIDを生成せず連番で一意にする。
+    """
+    return CustomerId(f'CUST{next(_customer_sequence):06d}')
\ No newline at end of file
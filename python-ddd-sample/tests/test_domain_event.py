@@ -0,0 +1,36 @@
+"""
+DomainEvent基底クラスのテスト
+"""
+import pytest
+from dataclasses import dataclass
+from typing import Any, Dict
+from domain.shared.domain_event import DomainEvent
+
+
+class TestDomainEvent:
+    """ドメインイベント基底クラスのテスト"""
+    
+    def test_concrete_event_without_event_name_is_rejected(self):
+        """EVENT_NAMEを宣言しない具象イベントはクラス定義時にエラー"""
+        with pytest.raises(TypeError, match='EVENT_NAMEを宣言する必要があります'):
+            @dataclass(frozen=True)
+            class UnnamedEvent(DomainEvent):
+                def _get_event_data(self) -> Dict[str, Any]:
+                    return {}
+    
+    def test_abstract_intermediate_event_may_omit_event_name(self):
+        """抽象メソッドが残る中間クラスはEVENT_NAMEなしで定義でき、具象側で宣言する"""
+        @dataclass(frozen=True)
+        class BaseAuditEvent(DomainEvent):
+            pass
+        
+        @dataclass(frozen=True)
+        class AuditEvent(BaseAuditEvent):
+            EVENT_NAME = 'Audit'
+            
+            def _get_event_data(self) -> Dict[str, Any]:
+                return {}
+        
+        event = AuditEvent(aggregate_id='A1')
+        assert event.event_name() == 'Audit'
+        assert event.to_dict()['event_name'] == 'Audit'
\ No newline at end of file
@@ -21,14 +21,34 @@ from domain.order.order import Order
 from domain.order.product_id import ProductId
 from domain.customer.customer_id import CustomerId
 from domain.shared.money import Money
+from tests.helpers import next_customer_id
+
+Y1000 = Money.from_yen(1000)
+
+PROD001, PROD002, LAPTOP, MOUSE, BOOK, TEST = map(
+    ProductId, ('PROD001', 'PROD002', 'LAPTOP', 'MOUSE', 'BOOK', 'TEST')
+)
+
+# 状態を持たないハンドラーなので、テスト間で同じインスタンスを使い回す
+ORDER_PLACED_HANDLERS = (
+    SendOrderConfirmationEmailHandler(),
+    NotifyInventorySystemHandler(),
+    UpdateAnalyticsHandler()
+)
+ORDER_CANCELLED_HANDLERS = (
+    ReleaseInventoryHandler(),
+    RefundPaymentHandler(),
+    SendCancellationEmailHandler()
+)
 
 
 class TestEventBus:
     """イベントバスのテスト"""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _use_event_bus(self, event_bus):
         """各テストの前準備"""
-        self.event_bus = InMemoryEventBus()
+        self.event_bus = event_bus
     
     def test_subscribe_and_publish_sync(self):
         """同期的なイベント購読と配信"""
@@ -40,18 +60,15 @@ class TestEventBus:
         self.event_bus.subscribe(inventory_handler)
         
         # 注文を作成して確定
-        order = Order.create(CustomerId.generate())
-        order.add_item(ProductId('PROD001'), 2, Money.from_yen(1000))
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 2, Y1000)
         order.place()
         
-        # イベントを取得して配信
-        events = order.pull_domain_events()
-        for event in events:
-            self.event_bus.publish_sync(event)
+        # イベントを取得してまとめて配信
+        self.event_bus.publish_many_sync(order.pull_domain_events())
         
         # イベント履歴を確認
-        history = self.event_bus.get_event_history()
-        assert len(history) == 2  # OrderCreated, OrderPlaced
+        assert self.event_bus.event_count() == 3  # OrderCreated, OrderItemAdded, OrderPlaced
     
     @pytest.mark.asyncio
     async def test_async_event_publishing(self):
@@ -61,18 +78,16 @@ class TestEventBus:
         self.event_bus.subscribe(analytics_handler)
         
         # 注文を作成して確定
-        order = Order.create(CustomerId.generate())
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(5000))
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 1, Money.from_yen(5000))
         order.place()
         
-        # イベントを非同期で配信
+        # イベントを非同期で配信（互いに独立しているので一度にgatherする）
         events = order.pull_domain_events()
-        for event in events:
-            await self.event_bus.publish(event)
+        await asyncio.gather(*(self.event_bus.publish(event) for event in events))
         
         # 処理が完了していることを確認
-        history = self.event_bus.get_event_history()
-        assert len(history) == 2
+        assert self.event_bus.event_count() == 3
     
     def test_handler_count(self):
         """ハンドラー登録数の確認"""
@@ -94,29 +109,147 @@ class TestEventBus:
         # ハンドラーを解除
         self.event_bus.unsubscribe(handler1)
         assert self.event_bus.get_handler_count(OrderPlacedEvent) == 1
+    
+    def test_subscribe_returns_unsubscriber(self):
+        """subscribeの戻り値でその購読だけを解除できる"""
+        from domain.order.order_events import OrderPlacedEvent
+        
+        handler = SendOrderConfirmationEmailHandler()
+        dispose = self.event_bus.subscribe(handler)
+        self.event_bus.subscribe(handler)
+        assert self.event_bus.get_handler_count(OrderPlacedEvent) == 2
+        
+        dispose()
+        assert self.event_bus.get_handler_count(OrderPlacedEvent) == 1
+        
+        # 二度呼んでも他の購読には影響しない
+        dispose()
+        assert self.event_bus.get_handler_count(OrderPlacedEvent) == 1
+
+    
+    def test_event_history_is_bounded(self):
+        """履歴は指定件数を超えると古いものから捨てられる"""
+        from domain.order.order_events import OrderCreatedEvent, OrderPlacedEvent
+        
+        event_bus = InMemoryEventBus(history_size=2)
+        
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 1, Y1000)
+        order.place()
+        events = order.pull_domain_events()
+        for event in events:
+            event_bus.publish_sync(event)
+        
+        assert event_bus.get_event_history() == events[-2:]
+        
+        # 件数は捨てられたイベントの分を差し引いて数える
+        assert event_bus.event_count() == 2
+        assert event_bus.count_of(OrderCreatedEvent) == 0
+        assert event_bus.count_of(OrderPlacedEvent) == 1
+        assert event_bus.last_event() is events[-1]
+        
+        # まとめて配信して一度にあふれた場合も同じ
+        batch_bus = InMemoryEventBus(history_size=2)
+        batch_bus.publish_many_sync(events)
+        assert batch_bus.get_event_history() == events[-2:]
+        assert batch_bus.count_of(OrderCreatedEvent) == 0
+        assert batch_bus.count_of(OrderPlacedEvent) == 1
+    
+    def test_event_history_can_be_disabled(self):
+        """history_size=0なら履歴を記録しない"""
+        event_bus = InMemoryEventBus(history_size=0)
+        
+        order = Order.create(next_customer_id())
+        for event in order.pull_domain_events():
+            event_bus.publish_sync(event)
+        
+        assert event_bus.get_event_history() == []
+        assert event_bus.event_count() == 0
+        assert event_bus.last_event() is None
+        event_bus.clear_history()
+    
+    def test_subscribe_during_publish_takes_effect_next_time(self):
+        """配信中に追加された購読は、その配信には含まれない"""
+        from domain.order.order_events import OrderCreatedEvent
+        from application.event_handler import EventHandler
+        
+        calls = []
+        
+        class LateHandler(EventHandler):
+            event_type = OrderCreatedEvent
+            
+            def handle(self, event):
+                calls.append('late')
+        
+        event_bus = self.event_bus
+        
+        class SubscribingHandler(EventHandler):
+            event_type = OrderCreatedEvent
+            
+            def handle(self, event):
+                calls.append('subscribing')
+                event_bus.subscribe(LateHandler())
+        
+        dispose = event_bus.subscribe(SubscribingHandler())
+        event_bus.publish_sync(OrderCreatedEvent(aggregate_id='ORDER001'))
+        assert calls == ['subscribing']
+        
+        dispose()
+        event_bus.publish_sync(OrderCreatedEvent(aggregate_id='ORDER001'))
+        assert calls == ['subscribing', 'late']
+    
+    def test_handler_for_base_event_receives_subclass_events(self):
+        """基底イベントクラスへの購読はすべての派生イベントを受け取る"""
+        from domain.shared.domain_event import DomainEvent
+        from application.event_handler import EventHandler
+        
+        class RecordingHandler(EventHandler):
+            event_type = DomainEvent
+            
+            def __init__(self):
+                self.received = []
+            
+            def handle(self, event):
+                self.received.append(event.event_name())
+        
+        handler = RecordingHandler()
+        self.event_bus.subscribe(handler)
+        
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 1, Y1000)
+        order.place()
+        for event in order.pull_domain_events():
+            self.event_bus.publish_sync(event)
+        
+        assert handler.received == ['OrderCreated', 'OrderItemAdded', 'OrderPlaced']
+        
+        # 解除後は配信されない（解決済みの一覧も破棄される）
+        self.event_bus.unsubscribe(handler)
+        order.cancel()
+        for event in order.pull_domain_events():
+            self.event_bus.publish_sync(event)
+        assert len(handler.received) == 3
 
 
 class TestOrderEventFlow:
     """注文イベントフローの統合テスト"""
     
     @pytest.mark.asyncio
-    async def test_complete_order_flow_with_events(self):
+    async def test_complete_order_flow_with_events(self, event_bus):
         """イベント配信を含む完全な注文フロー"""
-        # イベントバスとハンドラーをセットアップ
-        event_bus = InMemoryEventBus()
+        from domain.order.order_events import OrderItemAddedEvent
         
         # OrderPlacedイベントのハンドラーを登録
-        event_bus.subscribe(SendOrderConfirmationEmailHandler())
-        event_bus.subscribe(NotifyInventorySystemHandler())
-        event_bus.subscribe(UpdateAnalyticsHandler())
+        for handler in ORDER_PLACED_HANDLERS:
+            event_bus.subscribe(handler)
         
         # イベントバス付きリポジトリを作成
         repository = InMemoryOrderRepository(event_bus)
         
         # 注文を作成
         order = Order.create(CustomerId('CUST001'))
-        order.add_item(ProductId('LAPTOP'), 1, Money.from_yen(150000))
-        order.add_item(ProductId('MOUSE'), 2, Money.from_yen(3000))
+        order.add_item(LAPTOP, 1, Money.from_yen(150000))
+        order.add_item(MOUSE, 2, Money.from_yen(3000))
         
         # 注文を保存（OrderCreatedイベントが配信される）
         await repository.save(order)
@@ -124,33 +257,29 @@ class TestOrderEventFlow:
         # 注文を確定
         order.place()
         
-        # 再度保存（OrderPlacedイベントが配信される）
-        await repository.save(order)
+        # 保存し直さずイベントだけを配信（OrderPlacedイベントが配信される）
+        await repository.flush_events(order)
         
         # イベント履歴を確認
-        history = event_bus.get_event_history()
-        assert len(history) == 3  # OrderCreated, OrderItemAdded, OrderPlaced
+        assert event_bus.event_count() == 4  # OrderCreated, OrderItemAdded x2, OrderPlaced
+        assert event_bus.count_of(OrderItemAddedEvent) == 2
         
         # 最後のイベントがOrderPlacedであることを確認
-        assert history[-1].event_name() == 'OrderPlaced'
+        assert event_bus.last_event().event_name() == 'OrderPlaced'
     
     @pytest.mark.asyncio
-    async def test_order_cancellation_flow(self):
+    async def test_order_cancellation_flow(self, event_bus):
         """注文キャンセルフローのテスト"""
-        # イベントバスとハンドラーをセットアップ
-        event_bus = InMemoryEventBus()
-        
         # OrderCancelledイベントのハンドラーを登録
-        event_bus.subscribe(ReleaseInventoryHandler())
-        event_bus.subscribe(RefundPaymentHandler())
-        event_bus.subscribe(SendCancellationEmailHandler())
+        for handler in ORDER_CANCELLED_HANDLERS:
+            event_bus.subscribe(handler)
         
         # イベントバス付きリポジトリを作成
         repository = InMemoryOrderRepository(event_bus)
         
         # 注文を作成して確定
         order = Order.create(CustomerId('CUST002'))
-        order.add_item(ProductId('BOOK'), 3, Money.from_yen(1500))
+        order.add_item(BOOK, 3, Money.from_yen(1500))
         order.place()
         
         # 保存
@@ -162,21 +291,17 @@ class TestOrderEventFlow:
         # 再度保存（OrderCancelledイベントが配信される）
         await repository.save(order)
         
-        # イベント履歴を確認
-        history = event_bus.get_event_history()
-        
         # 最後のイベントがOrderCancelledであることを確認
-        assert history[-1].event_name() == 'OrderCancelled'
-        assert history[-1]._get_event_data()['reason'] == "顧客都合によるキャンセル"
+        last = event_bus.last_event()
+        assert last.event_name() == 'OrderCancelled'
+        assert last._get_event_data()['reason'] == "顧客都合によるキャンセル"
 
 
 class TestEventHandlerIsolation:
     """イベントハンドラーの独立性テスト"""
     
-    def test_handler_error_isolation(self):
+    def test_handler_error_isolation(self, event_bus):
         """一つのハンドラーのエラーが他に影響しないことを確認"""
-        event_bus = InMemoryEventBus()
-        
         # エラーを起こすハンドラーのモック
         class FailingHandler(SendOrderConfirmationEmailHandler):
             def handle(self, event):
@@ -190,15 +315,131 @@ class TestEventHandlerIsolation:
         event_bus.subscribe(normal_handler)
         
         # 注文を作成して確定
-        order = Order.create(CustomerId.generate())
-        order.add_item(ProductId('TEST'), 1, Money.from_yen(1000))
+        order = Order.create(next_customer_id())
+        order.add_item(TEST, 1, Y1000)
         order.place()
         
         # イベントを配信（エラーが起きても続行される）
-        events = order.pull_domain_events()
-        for event in events:
-            event_bus.publish_sync(event)
+        event_bus.publish_many_sync(order.pull_domain_events())
         
         # イベント履歴には記録されている
-        history = event_bus.get_event_history()
-        assert len(history) == 2  # OrderCreated, OrderPlaced
\ No newline at end of file
+        assert event_bus.event_count() == 3  # OrderCreated, OrderItemAdded, OrderPlaced
+    
+    def test_publish_many_sync_continues_after_failure(self, event_bus):
+        """まとめて配信しても、失敗したイベントの後ろのイベントは配信される"""
+        from domain.shared.domain_event import DomainEvent
+        from application.event_handler import EventHandler
+        
+        class FlakyHandler(EventHandler):
+            event_type = DomainEvent
+            
+            def __init__(self):
+                self.received = []
+            
+            def handle(self, event):
+                if event.event_name() == 'OrderItemAdded':
+                    raise RuntimeError("Simulated failure")
+                self.received.append(event.event_name())
+        
+        handler = FlakyHandler()
+        event_bus.subscribe(handler)
+        
+        order = Order.create(next_customer_id())
+        order.add_item(TEST, 1, Y1000)
+        order.place()
+        event_bus.publish_many_sync(order.pull_domain_events())
+        
+        assert handler.received == ['OrderCreated', 'OrderPlaced']
+        assert event_bus.event_count() == 3
+    
+    def test_handler_error_is_logged(self, event_bus, caplog):
+        """ハンドラーのエラーはERRORレベルでログに残る"""
+        from domain.order.order_events import OrderCreatedEvent
+        from application.event_handler import EventHandler
+        
+        class FailingHandler(EventHandler):
+            event_type = OrderCreatedEvent
+            
+            def handle(self, event):
+                raise RuntimeError("Simulated failure")
+        
+        event_bus.subscribe(FailingHandler())
+        
+        with caplog.at_level('ERROR', logger='infrastructure.event_bus'):
+            event_bus.publish_sync(OrderCreatedEvent(aggregate_id='ORDER001'))
+        
+        assert len(caplog.records) == 1
+        assert 'FailingHandler' in caplog.records[0].getMessage()
+        assert 'Simulated failure' in caplog.records[0].getMessage()
+    
+    @pytest.mark.asyncio
+    async def test_async_handler_error_isolation(self, event_bus, caplog):
+        """非同期配信でも失敗したハンドラーは記録され、他のハンドラーは動く"""
+        from domain.order.order_events import OrderCreatedEvent
+        from application.event_handler import EventHandler
+        
+        received = []
+        
+        class FailingHandler(EventHandler):
+            event_type = OrderCreatedEvent
+            
+            async def handle_async(self, event):
+                raise RuntimeError("Simulated failure")
+            
+            def handle(self, event):
+                raise RuntimeError("Simulated failure")
+        
+        class RecordingHandler(EventHandler):
+            event_type = OrderCreatedEvent
+            
+            def handle(self, event):
+                received.append(event.aggregate_id)
+        
+        event_bus.subscribe(FailingHandler())
+        event_bus.subscribe(RecordingHandler())
+        
+        with caplog.at_level('ERROR', logger='infrastructure.event_bus'):
+            await event_bus.publish(OrderCreatedEvent(aggregate_id='ORDER001'))
+        
+        assert received == ['ORDER001']
+        assert len(caplog.records) == 1
+
+
+class TestNotifyInventorySystemHandler:
+    """在庫システム通知ハンドラーのテスト"""
+    
+    def _placed_event(self):
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 2, Y1000)
+        order.add_item(PROD002, 1, Money.from_yen(500))
+        order.place()
+        return order.pull_domain_events()[-1]
+    
+    def test_reserves_in_one_call_when_bulk_supported(self):
+        """一括予約に対応したサービスには1回だけ問い合わせる"""
+        class BulkInventoryService:
+            def __init__(self):
+                self.calls = []
+            
+            def reserve_stock_bulk(self, items):
+                self.calls.append(items)
+        
+        service = BulkInventoryService()
+        event = self._placed_event()
+        NotifyInventorySystemHandler(service).handle(event)
+        
+        assert service.calls == [event.items]
+    
+    def test_falls_back_to_per_item_reservation(self):
+        """一括予約がなければ明細ごとに予約する"""
+        class InventoryService:
+            def __init__(self):
+                self.reserved = []
+            
+            def reserve_stock(self, product_id, quantity):
+                self.reserved.append((product_id, quantity))
+        
+        service = InventoryService()
+        NotifyInventorySystemHandler(service).handle(self._placed_event())
+        
+        assert service.reserved == [('PROD001', 2), ('PROD002', 1)]
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+InMemoryOrderRepositoryのテスト
+"""
+import pytest
+from infrastructure.in_memory_order_repository import InMemoryOrderRepository
+from domain.order.order import Order
+from domain.order.product_id import ProductId
+from domain.customer.customer_id import CustomerId
+from domain.shared.money import Money
+
+PROD001 = ProductId('PROD001')
+
+
+class TestInMemoryOrderRepository:
+    """インメモリ注文リポジトリのテスト"""
+    
+    def setup_method(self):
+        """各テストの前準備"""
+        self.repository = InMemoryOrderRepository()
+    
+    def _create_order(self, customer_id: CustomerId) -> Order:
+        order = Order.create(customer_id)
+        order.add_item(PROD001, 1, Money.from_yen(1000))
+        return order
+    
+    @pytest.mark.asyncio
+    async def test_find_by_customer_id(self):
+        """顧客ごとの注文を保存順に返す"""
+        alice = CustomerId('CUST001')
+        bob = CustomerId('CUST002')
+        first = self._create_order(alice)
+        other = self._create_order(bob)
+        second = self._create_order(alice)
+        
+        for order in (first, other, second):
+            await self.repository.save(order)
+        await self.repository.save(first)  # 再保存しても重複しない
+        
+        assert await self.repository.find_by_customer_id(alice) == [first, second]
+        assert await self.repository.find_by_customer_id(bob) == [other]
+        assert await self.repository.find_by_customer_id(CustomerId('CUST999')) == []
+    
+    @pytest.mark.asyncio
+    async def test_delete_removes_order_from_customer_lookup(self):
+        """削除した注文は顧客IDでも見つからない"""
+        customer_id = CustomerId('CUST001')
+        order = self._create_order(customer_id)
+        await self.repository.save(order)
+        
+        await self.repository.delete(order.id)
+        
+        assert await self.repository.find_by_id(order.id) is None
+        assert await self.repository.find_by_customer_id(customer_id) == []
+        assert self.repository.size() == 0
+    
+    @pytest.mark.asyncio
+    async def test_flush_events_requires_saved_order(self):
+        """保存していない注文のイベントだけを配信することはできない"""
+        order = self._create_order(CustomerId('CUST001'))
+        
+        with pytest.raises(ValueError, match='保存されていない注文です'):
+            await self.repository.flush_events(order)
+        
+        # イベントは取り出されずに残る
+        assert len(order.get_domain_events()) == 2
\ No newline at end of file
@@ -30,6 +30,39 @@ class TestMoney:
         assert zero.amount == 0
         assert zero.is_zero()
     
+    def test_zero_is_shared_per_currency(self):
+        """ゼロ金額は通貨ごとに同じインスタンスを返す"""
+        assert Money.zero() is Money.zero('JPY')
+        assert Money.zero('USD') is not Money.zero('JPY')
+        assert Money.zero('USD').currency == 'USD'
+    
+    def test_from_yen_reuses_instances(self):
+        """from_yenは同じ金額に同じインスタンスを返す"""
+        assert Money.from_yen(1000) is Money.from_yen(1000)
+        assert Money.from_yen(1000) == Money(1000, 'JPY')
+        
+        with pytest.raises(ValueError, match='金額は0以上'):
+            Money.from_yen(-1)
+    
+    def test_from_yen_cache_is_not_shared_with_equal_non_int_keys(self):
+        """floatやboolで呼んでも、intで呼んだときの結果は変わらない"""
+        assert Money.from_yen(1234.0).amount == 1234.0
+        
+        money = Money.from_yen(1234)
+        assert type(money.amount) is int
+        assert money.format() == '¥1,234'
+        
+        assert type(Money.from_yen(True).amount) is bool
+        assert type(Money.from_yen(1).amount) is int
+    
+    def test_identity_operations_return_same_value(self):
+        """ゼロの加算・1倍は値が変わらず、0倍はゼロになる"""
+        money = Money(1000, 'JPY')
+        
+        assert money.add(Money.zero()) == money
+        assert money.multiply(1) == money
+        assert money.multiply(0) == Money.zero()
+    
     def test_add_money(self):
         """金額の加算"""
         money1 = Money(1000, 'JPY')
@@ -82,6 +115,9 @@ class TestMoney:
         
         assert money1 == money2
         assert money1 != money3
+        assert money1 != Money(1000, 'USD')
+        assert money1 != 1000
+        assert hash(money1) == hash(money2)
     
     def test_format(self):
         """フォーマット出力"""
@@ -1,6 +1,7 @@
 """
 Order Aggregateのテスト
 """
+import copy
 import pytest
 from datetime import datetime
 from domain.order.order import Order, OrderStatus
@@ -8,6 +9,11 @@ from domain.order.order_id import OrderId
 from domain.order.product_id import ProductId
 from domain.customer.customer_id import CustomerId
 from domain.shared.money import Money
+from tests.helpers import next_customer_id
+
+Y500, Y1000, Y2000, Y5000 = map(Money.from_yen, (500, 1000, 2000, 5000))
+
+PROD001, PROD002 = map(ProductId, ('PROD001', 'PROD002'))
 
 
 class TestOrder:
@@ -25,31 +31,44 @@ class TestOrder:
     
     def test_add_item(self):
         """商品の追加"""
-        order = Order.create(CustomerId.generate())
-        product_id = ProductId('PROD001')
+        order = Order.create(next_customer_id())
+        product_id = PROD001
         
-        order.add_item(product_id, 2, Money.from_yen(1000))
+        order.add_item(product_id, 2, Y1000)
         
         assert order.item_count == 1
-        assert order.total_amount == Money.from_yen(2000)
+        assert order.total_amount == Y2000
     
     def test_add_same_product_increases_quantity(self):
         """同じ商品を追加すると数量が増える"""
-        order = Order.create(CustomerId.generate())
-        product_id = ProductId('PROD001')
+        order = Order.create(next_customer_id())
+        product_id = PROD001
         
-        order.add_item(product_id, 2, Money.from_yen(1000))
-        order.add_item(product_id, 3, Money.from_yen(1000))
+        order.add_item(product_id, 2, Y1000)
+        order.add_item(product_id, 3, Y1000)
         
         assert order.item_count == 1  # 商品種類は1つ
-        assert order.total_amount == Money.from_yen(5000)  # 5個分
+        assert order.total_amount == Y5000  # 5個分
+    
+    def test_product_id_of_reuses_instances(self):
+        """ProductId.ofは同じ商品コードに同じインスタンスを返す"""
+        assert ProductId.of('PROD001') is ProductId.of('PROD001')
+        assert ProductId.of('PROD001') == PROD001
+        
+        order = Order.create(next_customer_id())
+        order.add_item(ProductId.of('PROD001'), 1, Y1000)
+        order.add_item(PROD001, 1, Y1000)
+        assert order.item_count == 1
+        
+        with pytest.raises(ValueError, match='ProductIdは空にできません'):
+            ProductId.of('')
     
     def test_remove_item(self):
         """商品の削除"""
-        order = Order.create(CustomerId.generate())
-        product_id = ProductId('PROD001')
+        order = Order.create(next_customer_id())
+        product_id = PROD001
         
-        order.add_item(product_id, 2, Money.from_yen(1000))
+        order.add_item(product_id, 2, Y1000)
         order.remove_item(product_id)
         
         assert order.item_count == 0
@@ -57,30 +76,114 @@ class TestOrder:
     
     def test_change_item_quantity(self):
         """商品数量の変更"""
-        order = Order.create(CustomerId.generate())
-        product_id = ProductId('PROD001')
+        order = Order.create(next_customer_id())
+        product_id = PROD001
         
-        order.add_item(product_id, 2, Money.from_yen(1000))
+        order.add_item(product_id, 2, Y1000)
         order.change_item_quantity(product_id, 5)
         
-        assert order.total_amount == Money.from_yen(5000)
+        assert order.total_amount == Y5000
+    
+    def test_item_subtotal_follows_quantity_change(self):
+        """数量を変えると明細の小計も更新される"""
+        order = Order.create(next_customer_id())
+        product_id = PROD001
+        
+        order.add_item(product_id, 2, Y1000)
+        order.add_item(product_id, 1, Y1000)
+        assert order.get_items()[0].subtotal == Money.from_yen(3000)
+        
+        order.change_item_quantity(product_id, 4)
+        assert order.get_items()[0].subtotal == Money.from_yen(4000)
+    
+    def test_total_follows_mixed_changes(self):
+        """追加・数量変更・削除を重ねても合計金額が一致する"""
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 2, Y1000)
+        order.add_item(PROD002, 1, Y500)
+        order.add_item(PROD001, 1, Y1000)
+        order.change_item_quantity(PROD001, 1)
+        order.remove_item(PROD002)
+        
+        assert order.item_count == 1
+        assert order.total_amount == Y1000
+    
+    def test_adding_negative_quantity_to_existing_item_reduces_total(self):
+        """既存商品に負の数量を追加すると数量と合計金額が減る"""
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 3, Y1000)
+        order.add_item(PROD001, -1, Y1000)
+        
+        assert order.get_items()[0].quantity == 2
+        assert order.total_amount == Y2000
+        
+        # 数量が0以下になる追加は失敗し、明細も合計金額も変わらない
+        with pytest.raises(ValueError, match='数量は1以上'):
+            order.add_item(PROD001, -2, Y1000)
+        assert order.get_items()[0].quantity == 2
+        assert order.total_amount == Y2000
+    
+    def test_add_items_with_negative_quantity_for_existing_item(self):
+        """まとめて追加する場合も負の数量の追加で合計金額が明細と一致する"""
+        order = Order.create(next_customer_id())
+        order.add_items([
+            (PROD001, 3, Y1000),
+            (PROD001, -1, Y1000),
+        ])
+        
+        assert order.get_items()[0].quantity == 2
+        assert order.total_amount == Y2000
+        
+        with pytest.raises(ValueError, match='数量は1以上'):
+            order.add_items([(PROD002, 1, Y500), (PROD001, -2, Y1000)])
+        assert order.get_items()[0].quantity == 2
+        assert order.total_amount == Money.from_yen(2500)
+    
+    def test_add_items_matches_repeated_add_item(self):
+        """まとめて追加しても1件ずつ追加した場合と同じ結果になる"""
+        order = Order.create(next_customer_id())
+        order.add_items([
+            (PROD001, 2, Y1000),
+            (PROD002, 1, Y500),
+            (PROD001, 1, Y1000),
+        ])
+        
+        assert order.item_count == 2
+        assert order.total_amount == Money.from_yen(3500)
+        assert order.get_items()[0].quantity == 3
+    
+    def test_add_items_keeps_total_consistent_on_error(self):
+        """途中で失敗しても追加済みの明細と合計金額は一致する"""
+        order = Order.create(next_customer_id())
+        
+        with pytest.raises(ValueError, match='数量'):
+            order.add_items([
+                (PROD001, 2, Y1000),
+                (PROD002, 0, Y500),
+            ])
+        
+        assert order.item_count == 1
+        assert order.total_amount == Y2000
     
     def test_max_items_limit(self):
         """最大商品数の制限"""
-        order = Order.create(CustomerId.generate())
+        order = Order.create(next_customer_id())
+        
+        price = Money.from_yen(100)
         
-        # 最大数まで追加
-        for i in range(Order.MAX_ITEMS):
-            order.add_item(ProductId(f'PROD{i:03d}'), 1, Money.from_yen(100))
+        # 上限の1つ手前までまとめて追加し、境界は公開のadd_itemで確かめる
+        order.add_items((ProductId(f'PROD{i:03d}'), 1, price) for i in range(Order.MAX_ITEMS - 1))
+        order.add_item(ProductId('LAST'), 1, price)
+        assert order.item_count == Order.MAX_ITEMS
         
         # 追加でエラー
         with pytest.raises(ValueError, match='最大'):
-            order.add_item(ProductId('EXTRA'), 1, Money.from_yen(100))
+            order.add_item(ProductId('EXTRA'), 1, price)
     
     def test_place_order(self):
         """注文の確定"""
-        order = Order.create(CustomerId.generate())
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(1000))
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 1, Y1000)
         
         order.place()
         
@@ -88,31 +191,58 @@ class TestOrder:
         assert order.placed_at is not None
         assert isinstance(order.placed_at, datetime)
     
+    def test_placed_event_carries_line_items(self):
+        """確定イベントは明細をタプルで持ち、to_dictで辞書に変換する"""
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 2, Y1000)
+        order.place()
+        
+        event = order.pull_domain_events()[-1]
+        assert event.placed_at == event.occurred_at == order.placed_at
+        assert event.items[0].product_id == 'PROD001'
+        assert event.items[0].subtotal == 2000
+        assert event.to_dict()['data']['items'] == [
+            {'product_id': 'PROD001', 'quantity': 2, 'unit_price': 1000, 'subtotal': 2000}
+        ]
+        
+        # 呼び出しごとに組み立てるので、戻り値を書き換えても次の変換結果は変わらない
+        first = event.to_dict()
+        first['event_name'] = 'Changed'
+        first['data']['total_amount'] = -1
+        first['data']['items'][0]['quantity'] = 99
+        first['data']['items'].clear()
+        second = event.to_dict()
+        assert second['event_name'] == 'OrderPlaced'
+        assert second['data']['total_amount'] == 2000
+        assert second['data']['items'] == [
+            {'product_id': 'PROD001', 'quantity': 2, 'unit_price': 1000, 'subtotal': 2000}
+        ]
+    
     def test_cannot_place_empty_order(self):
         """空の注文は確定できない"""
-        order = Order.create(CustomerId.generate())
+        order = Order.create(next_customer_id())
         
         with pytest.raises(ValueError, match='商品が選択されていません'):
             order.place()
     
     def test_cannot_modify_placed_order(self):
         """確定済み注文は変更できない"""
-        order = Order.create(CustomerId.generate())
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(1000))
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 1, Y1000)
         order.place()
         
         # 商品追加不可
         with pytest.raises(ValueError, match='変更可能'):
-            order.add_item(ProductId('PROD002'), 1, Money.from_yen(500))
+            order.add_item(PROD002, 1, Y500)
         
         # 商品削除不可
         with pytest.raises(ValueError, match='変更可能'):
-            order.remove_item(ProductId('PROD001'))
+            order.remove_item(PROD001)
     
     def test_order_status_transitions(self):
         """注文ステータスの遷移"""
-        order = Order.create(CustomerId.generate())
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(1000))
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 1, Y1000)
         
         # DRAFT -> PLACED
         order.place()
@@ -130,10 +260,29 @@ class TestOrder:
         order.deliver()
         assert order.status == OrderStatus.DELIVERED
     
+    def test_invalid_status_transitions_raise_error(self):
+        """遷移表にない遷移はエラー"""
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 1, Y1000)
+        
+        with pytest.raises(ValueError, match='確定済みの注文のみ支払い可能'):
+            order.mark_as_paid()
+        
+        order.place()
+        with pytest.raises(ValueError, match='支払い済みの注文のみ出荷可能'):
+            order.ship()
+        with pytest.raises(ValueError, match='下書き状態の注文のみ確定'):
+            order.place()
+        
+        order.cancel()
+        with pytest.raises(ValueError, match='確定済みの注文のみ支払い可能'):
+            order.mark_as_paid()
+        assert order.status == OrderStatus.CANCELLED
+    
     def test_cancel_order(self):
         """注文のキャンセル"""
-        order = Order.create(CustomerId.generate())
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(1000))
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 1, Y1000)
         order.place()
         
         order.cancel()
@@ -141,8 +290,8 @@ class TestOrder:
     
     def test_cannot_cancel_shipped_order(self):
         """出荷済み注文はキャンセルできない"""
-        order = Order.create(CustomerId.generate())
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(1000))
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 1, Y1000)
         order.place()
         order.mark_as_paid()
         order.ship()
@@ -152,13 +301,89 @@ class TestOrder:
     
     def test_get_items_returns_snapshot(self):
         """商品リストはスナップショットを返す"""
-        order = Order.create(CustomerId.generate())
-        product_id = ProductId('PROD001')
-        order.add_item(product_id, 2, Money.from_yen(1000))
+        order = Order.create(next_customer_id())
+        product_id = PROD001
+        order.add_item(product_id, 2, Y1000)
         
         items = order.get_items()
         
         # スナップショットなので変更しても影響なし
         assert len(items) == 1
-        assert items[0]['quantity'] == 2
-        assert items[0]['subtotal'] == Money.from_yen(2000)
\ No newline at end of file
+        assert items[0].quantity == 2
+        assert items[0].subtotal == Y2000
+    
+    def test_get_items_snapshot_refreshes_after_change(self):
+        """明細を変更すると新しいスナップショットが返る"""
+        order = Order.create(next_customer_id())
+        product_id = PROD001
+        order.add_item(product_id, 2, Y1000)
+        
+        before = order.get_items()
+        assert order.get_items() is before
+        
+        order.change_item_quantity(product_id, 3)
+        after = order.get_items()
+        
+        assert before[0].quantity == 2
+        assert after[0].quantity == 3
+    
+    def test_iter_items_matches_get_items(self):
+        """iter_itemsはget_itemsと同じ明細を順に返す"""
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 2, Y1000)
+        order.add_item(PROD002, 1, Y500)
+        
+        lazily = list(order.iter_items())
+        assert tuple(lazily) == order.get_items()
+        assert list(order.iter_items()) == lazily
+        assert [item.product_id for item in lazily] == [PROD001, PROD002]
+    
+    def test_summary_reflects_latest_state(self):
+        """サマリーは状態変更後に組み立て直される"""
+        order = Order.create(next_customer_id())
+        order.add_item(PROD001, 2, Y1000)
+        
+        draft = order.summary()
+        assert draft['status'] == 'DRAFT'
+        assert draft['total_amount'] == '¥2,000'
+        
+        order.place()
+        placed = order.summary()
+        
+        assert placed['status'] == 'PLACED'
+        assert placed['placed_at'] is not None
+        assert draft['status'] == 'DRAFT'  # 以前の結果は変化しない
+    
+    def test_pull_domain_events_hands_over_and_clears(self):
+        """pull_domain_eventsはイベントを渡し、以後は空になる"""
+        order = Order(OrderId('ORDER001'), next_customer_id())
+        assert order.get_domain_events() == []
+        assert order.pull_domain_events() == []
+        
+        order.add_item(PROD001, 1, Y1000)
+        events = order.pull_domain_events()
+        
+        assert len(events) == 1
+        assert order.get_domain_events() == []
+        
+        order.add_item(PROD002, 1, Y500)
+        assert len(order.get_domain_events()) == 1
+        assert len(events) == 1  # 渡したリストは後続の追加の影響を受けない
+    
+    def test_copy_is_independent_of_original(self):
+        """複製した注文への変更は元の注文に影響しない"""
+        original = Order.create(next_customer_id())
+        original.add_item(PROD001, 2, Y1000)
+        
+        clone = copy.copy(original)
+        clone.add_item(PROD001, 1, Y1000)
+        clone.add_item(PROD002, 1, Y500)
+        
+        assert clone == original  # 同じID
+        assert clone.total_amount == Money.from_yen(3500)
+        assert len(clone.get_domain_events()) == 3
+        
+        assert original.item_count == 1
+        assert original.get_items()[0].quantity == 2
+        assert original.total_amount == Y2000
+        assert len(original.get_domain_events()) == 2
\ No newline at end of file
@@ -1,8 +1,8 @@
 """
 PricingService割引計算のテスト
 """
+import copy
 import pytest
-from domain.service.pricing_service import PricingService
 from domain.order.order import Order
 from domain.order.product_id import ProductId
 from domain.customer.customer import Customer
@@ -10,139 +10,164 @@ from domain.customer.customer_id import CustomerId
 from domain.customer.email import Email
 from domain.shared.money import Money
 
+Y5000, Y12000 = map(Money.from_yen, (5000, 12000))
+
+PROD001, LAPTOP = map(ProductId, ('PROD001', 'LAPTOP'))
+
+# 割引テスト共通の顧客IDと、その顧客の空の注文（各テストでcopy.copyして使う）
+CUSTOMER_ID = CustomerId('CUST-DISCOUNT')
+ORDER_TEMPLATE = Order.create(CUSTOMER_ID)
+
 
 class TestPricingServiceDiscount:
     """割引計算のテスト"""
     
-    def setup_method(self):
-        """各テストの前準備"""
-        self.service = PricingService()
-    
-    def test_no_discount_for_new_customer(self):
+    def test_no_discount_for_new_customer(self, pricing_service):
         """新規顧客（ポイントなし）は割引なし"""
         customer = Customer.create(
-            customer_id=CustomerId.generate(),
+            customer_id=CUSTOMER_ID,
             email=Email('new@example.com'),
             name='New Customer'
         )
         
-        order = Order.create(customer.id)
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(5000))
+        order = copy.copy(ORDER_TEMPLATE)
+        order.add_item(PROD001, 1, Y5000)
         
-        discount = self.service.calculate_discount(customer, order)
+        discount = pricing_service.calculate_discount(customer, order)
         
         assert discount == Money.zero()
     
-    def test_loyalty_points_1000_gives_5_percent(self):
+    def test_loyalty_points_1000_gives_5_percent(self, pricing_service):
         """1000ポイントで5%割引"""
         customer = Customer.create(
-            customer_id=CustomerId.generate(),
+            customer_id=CUSTOMER_ID,
             email=Email('loyal@example.com'),
             name='Loyal Customer'
         )
         # 1000ポイント追加
-        for _ in range(10):
-            customer.add_loyalty_points(100)
+        customer.add_loyalty_points(1000)
         
-        order = Order.create(customer.id)
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(5000))
+        order = copy.copy(ORDER_TEMPLATE)
+        order.add_item(PROD001, 1, Y5000)
         
-        discount = self.service.calculate_discount(customer, order)
+        discount = pricing_service.calculate_discount(customer, order)
         
         assert discount == Money.from_yen(250)  # 5000 * 0.05 = 250
     
-    def test_loyalty_points_2000_gives_10_percent(self):
+    def test_loyalty_points_2000_gives_10_percent(self, pricing_service):
         """2000ポイントで10%割引"""
         customer = Customer.create(
-            customer_id=CustomerId.generate(),
+            customer_id=CUSTOMER_ID,
             email=Email('vip@example.com'),
             name='VIP Customer'
         )
         # 2000ポイント追加
-        for _ in range(20):
-            customer.add_loyalty_points(100)
+        customer.add_loyalty_points(2000)
         
-        order = Order.create(customer.id)
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(5000))
+        order = copy.copy(ORDER_TEMPLATE)
+        order.add_item(PROD001, 1, Y5000)
         
-        discount = self.service.calculate_discount(customer, order)
+        discount = pricing_service.calculate_discount(customer, order)
         
         assert discount == Money.from_yen(500)  # 5000 * 0.10 = 500
     
-    def test_large_order_gets_additional_discount(self):
+    def test_large_order_gets_additional_discount(self, pricing_service):
         """10000円以上の注文で追加2%割引"""
         customer = Customer.create(
-            customer_id=CustomerId.generate(),
+            customer_id=CUSTOMER_ID,
             email=Email('big@example.com'),
             name='Big Spender'
         )
         # 1000ポイント追加（5%割引）
-        for _ in range(10):
-            customer.add_loyalty_points(100)
+        customer.add_loyalty_points(1000)
         
-        order = Order.create(customer.id)
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(12000))
+        order = copy.copy(ORDER_TEMPLATE)
+        order.add_item(PROD001, 1, Y12000)
         
-        discount = self.service.calculate_discount(customer, order)
+        discount = pricing_service.calculate_discount(customer, order)
         
         # 5% + 2% = 7%割引
         assert discount == Money.from_yen(840)  # 12000 * 0.07 = 840
     
-    def test_maximum_discount_cap_at_30_percent(self):
+    def test_maximum_discount_cap_at_30_percent(self, pricing_service):
         """最大割引率は30%に制限"""
         customer = Customer.create(
-            customer_id=CustomerId.generate(),
+            customer_id=CUSTOMER_ID,
             email=Email('super@example.com'),
             name='Super VIP'
         )
         # 大量のポイント追加
-        for _ in range(100):
-            customer.add_loyalty_points(100)
+        customer.add_loyalty_points(10000)
+        assert customer.loyalty_points == 10000
         
-        order = Order.create(customer.id)
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(100000))
+        order = copy.copy(ORDER_TEMPLATE)
+        order.add_item(PROD001, 1, Money.from_yen(100000))
         
-        discount = self.service.calculate_discount(customer, order)
+        discount = pricing_service.calculate_discount(customer, order)
         
         # 10000ポイントでも2000ポイント以上の条件で10%、大口注文で2%追加 = 12%
-        assert discount == Money.from_yen(12000)  # 100000 * 0.12 = 12000
+        assert discount == Y12000  # 100000 * 0.12 = 12000
     
-    def test_combined_loyalty_and_large_order_discount(self):
+    def test_combined_loyalty_and_large_order_discount(self, pricing_service):
         """ロイヤリティと大口注文の組み合わせ"""
         customer = Customer.create(
-            customer_id=CustomerId.generate(),
+            customer_id=CUSTOMER_ID,
             email=Email('combo@example.com'),
             name='Combo Customer'
         )
         # 2000ポイント追加（10%割引）
-        for _ in range(20):
-            customer.add_loyalty_points(100)
+        customer.add_loyalty_points(2000)
         
-        order = Order.create(customer.id)
-        order.add_item(ProductId('LAPTOP'), 1, Money.from_yen(150000))
+        order = copy.copy(ORDER_TEMPLATE)
+        order.add_item(LAPTOP, 1, Money.from_yen(150000))
         
-        discount = self.service.calculate_discount(customer, order)
+        discount = pricing_service.calculate_discount(customer, order)
         
         # 10% + 2% = 12%割引
         assert discount == Money.from_yen(18000)  # 150000 * 0.12 = 18000
     
-    def test_discount_calculation_with_final_amount(self):
+    def test_discount_calculation_with_final_amount(self, pricing_service):
         """割引を含む最終請求額の統合テスト"""
         customer = Customer.create(
-            customer_id=CustomerId.generate(),
+            customer_id=CUSTOMER_ID,
             email=Email('final@example.com'),
             name='Final Customer'
         )
         # 1500ポイント（5%割引）
-        for _ in range(15):
-            customer.add_loyalty_points(100)
+        customer.add_loyalty_points(1500)
         
-        order = Order.create(customer.id)
-        order.add_item(ProductId('PROD001'), 1, Money.from_yen(15000))
+        order = copy.copy(ORDER_TEMPLATE)
+        order.add_item(PROD001, 1, Money.from_yen(15000))
         
         # 割引: 15000 * 0.07 = 1050 (5% + 2%)
         # 送料: 0円（5000円以上）
         # 最終額: 15000 - 1050 + 0 = 13950
-        final_amount = self.service.calculate_final_amount(customer, order)
+        final_amount = pricing_service.calculate_final_amount(customer, order)
         
-        assert final_amount == Money.from_yen(13950)
\ No newline at end of file
+        assert final_amount == Money.from_yen(13950)
+    
+    @pytest.mark.parametrize('points, yen, active', [
+        (0, 3000, True),       # 割引なし・送料あり
+        (1500, 4999, True),    # 5%割引・送料あり
+        (2500, 12000, True),   # 12%割引・送料無料
+        (2500, 12000, False),  # 非アクティブなら割引なし
+    ])
+    def test_final_amount_matches_discount_and_shipping(self, points, yen, active, pricing_service):
+        """最終請求額は 小計 - 割引 + 送料 と一致する"""
+        customer = Customer.create(
+            customer_id=CUSTOMER_ID,
+            email=Email('sum@example.com'),
+            name='Sum Customer'
+        )
+        if points:
+            customer.add_loyalty_points(points)
+        if not active:
+            customer.deactivate()
+        
+        order = copy.copy(ORDER_TEMPLATE)
+        order.add_item(PROD001, 1, Money.from_yen(yen))
+        
+        expected = order.total_amount.subtract(
+            pricing_service.calculate_discount(customer, order)
+        ).add(pricing_service.calculate_shipping_fee(order))
+        assert pricing_service.calculate_final_amount(customer, order) == expected
\ No newline at end of file
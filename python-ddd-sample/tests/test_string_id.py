@@ -0,0 +1,33 @@
+"""
+文字列IDの値オブジェクトのテスト
+"""
+import pytest
+from dataclasses import FrozenInstanceError
+from domain.order.order_id import OrderId
+from domain.order.product_id import ProductId
+from domain.customer.customer_id import CustomerId
+
+
+class TestStringId:
+    """OrderId / ProductId / CustomerIdに共通する振る舞いのテスト"""
+    
+    @pytest.mark.parametrize('id_class', [OrderId, ProductId, CustomerId])
+    def test_equality_hash_and_validation(self, id_class):
+        """値で等価・ハッシュが一致し、空の値と変更は拒否する"""
+        first = id_class('ID001')
+        
+        assert first == id_class('ID001')
+        assert first != id_class('ID002')
+        assert hash(first) == hash(id_class('ID001'))
+        assert str(first) == 'ID001'
+        assert repr(first) == f"{id_class.__name__}(value='ID001')"
+        
+        with pytest.raises(ValueError, match=f'{id_class.__name__}は空にできません'):
+            id_class('  ')
+        with pytest.raises(FrozenInstanceError):
+            first.value = 'ID002'
+    
+    def test_different_id_classes_are_not_equal(self):
+        """値が同じでもIDの種類が違えば等しくない"""
+        assert OrderId('ID001') != ProductId('ID001')
+        assert CustomerId('ID001') != OrderId('ID001')
\ No newline at end of file